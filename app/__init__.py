@@ -4,8 +4,9 @@ from pathlib import Path
 from datetime import datetime
 from .config import Config, OUTPUT_DIR, TRAINED_MODELS_DIR, GENERATED_MOTIONS_DIR
 from .routes.main import main
-from .routes.duck import DuckBlueprint
+from .routes.duck import create_duck_blueprint
 from .routes.routes import DuckRoutes
+from .utils.responses import OrjsonProvider
 import logging
 
 def create_app(config_class=Config):
@@ -16,6 +17,7 @@ def create_app(config_class=Config):
                 template_folder=str(root_dir / 'app/templates'),
                 static_folder=str(root_dir / 'app/static'))
     
+    app.json = OrjsonProvider(app)
     CORS(app)
     app.config.from_object(config_class)
     
@@ -65,13 +67,9 @@ def create_app(config_class=Config):
     # Register blueprints
     app.register_blueprint(main)
     
-    # Create duck blueprints
-    open_duck_mini = DuckBlueprint('open_duck_mini', __name__, url_prefix='/open_duck_mini')
-    bdx = DuckBlueprint('bdx', __name__, url_prefix='/bdx')
-    
-    # Register duck blueprints
-    app.register_blueprint(open_duck_mini)
-    app.register_blueprint(bdx)
+    # Create and register duck blueprints
+    for duck_type in ('open_duck_mini', 'bdx'):
+        app.register_blueprint(create_duck_blueprint(duck_type))
     
     # Configure logging
     logging.basicConfig(
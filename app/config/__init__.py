@@ -104,10 +104,16 @@ class Config:
     OUTPUT_DIR = str(OUTPUT_DIR)
     TRAINED_MODELS_DIR = str(TRAINED_MODELS_DIR)
     GENERATED_MOTIONS_DIR = str(GENERATED_MOTIONS_DIR)
+    
+    # Let a fronting web server stream downloaded files (X-Sendfile header)
+    USE_X_SENDFILE = False
 
 class ProductionConfig(Config):
     """Production configuration."""
     FLASK_ENV = 'production'
+    # Only when a fronting server (e.g. Apache with mod_xsendfile) serves the
+    # X-Sendfile paths; without one, every send_file download would be empty
+    USE_X_SENDFILE = os.environ.get('USE_X_SENDFILE', '').lower() in ('1', 'true', 'yes')
     # Add production-specific settings here
 
 class DevelopmentConfig(Config):
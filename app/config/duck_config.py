@@ -1,7 +1,9 @@
+import functools
 import json
 import os
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from types import MappingProxyType
+from typing import Dict, List, Optional, Any, Callable, Mapping, Tuple
 
 
 class DuckConfig:
@@ -22,6 +24,20 @@ class DuckConfig:
             
         self.duck_types = {}
         self.internal_name_map = {}
+        self.variant_summaries = {}
+        self.variant_ids = {}
+        self._reload_hooks = []
+        
+        # Read-only view over duck_types, stays in sync as configs are saved
+        self._duck_types_view = MappingProxyType(self.duck_types)
+        self._duck_type_summaries = None
+        self._duck_type_ids = ()
+        
+        # Bumped on every (re)load so callers can tell when configs changed
+        self.version = 0
+        
+        # Bounded since variants come straight from request parameters
+        self.resolve_internal_name = functools.lru_cache(maxsize=256)(self._resolve_internal_name)
         self.load_all_configs()
     
     def load_all_configs(self) -> None:
@@ -35,22 +51,49 @@ class DuckConfig:
                     config = json.load(f)
                     duck_id = config.get('id')
                     if duck_id:
-                        self.duck_types[duck_id] = config
-                        
-                        # Build internal name mapping
-                        for variant_id, variant in config.get('variants', {}).items():
-                            internal_name = variant.get('internal_name')
-                            if internal_name:
-                                self.internal_name_map[internal_name] = {
-                                    'duck_type': duck_id,
-                                    'variant': variant_id
-                                }
+                        self._index_config(duck_id, config)
             except Exception as e:
                 print(f"Error loading duck configuration file {file_path}: {e}")
+        
+        self._run_reload_hooks()
+    
+    def _index_config(self, duck_id: str, config: Dict[str, Any]) -> None:
+        """Store a duck configuration and build the lookups derived from it."""
+        self.duck_types[duck_id] = config
+        self.variant_ids[duck_id] = tuple(config.get('variants', {}))
+        
+        for variant_id, variant in config.get('variants', {}).items():
+            # Build internal name mapping
+            internal_name = variant.get('internal_name')
+            if internal_name:
+                self.internal_name_map[internal_name] = {
+                    'duck_type': duck_id,
+                    'variant': variant_id
+                }
+            
+            # Precompute the variant summary shown on duck pages
+            self.variant_summaries[(duck_id, variant_id)] = MappingProxyType({
+                'id': variant_id,
+                'name': variant.get('name', variant_id),
+                'model_path': variant.get('model_path', ''),
+                'description': variant.get('description', '')
+            })
+    
+    def register_reload_hook(self, hook: Callable[[], None]) -> None:
+        """Register a callback to run whenever a configuration is (re)loaded."""
+        self._reload_hooks.append(hook)
     
-    def get_duck_types(self) -> Dict[str, Any]:
-        """Get all duck types."""
-        return self.duck_types
+    def _run_reload_hooks(self) -> None:
+        """Invalidate anything derived from the configuration."""
+        self.version += 1
+        self._duck_type_summaries = None
+        self.resolve_internal_name.cache_clear()
+        for hook in self._reload_hooks:
+            hook()
+    
+    def get_duck_types(self) -> Mapping[str, Any]:
+        """Get a read-only view of all duck types."""
+        return self._duck_types_view
     
     def get_duck_type(self, duck_type: str) -> Optional[Dict[str, Any]]:
         """Get a specific duck type configuration."""
@@ -63,6 +106,41 @@ class DuckConfig:
             return duck_config['variants'].get(variant)
         return None
     
+    def get_variant_summary(self, duck_type: str, variant: str) -> Optional[Mapping[str, Any]]:
+        """Get the id, name, model path and description of a variant."""
+        return self.variant_summaries.get((duck_type, variant))
+    
+    def list_variant_ids(self, duck_type: str) -> Tuple[str, ...]:
+        """List the variant ids of a duck type (empty if the duck type is unknown)."""
+        return self.variant_ids.get(duck_type, ())
+    
+    def validation_error(self, duck_type: str, variant: Optional[str] = None) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Check that a duck type exists and, if given, that it has the variant.
+        
+        Args:
+            duck_type: Duck type id
+            variant: Optional variant id
+            
+        Returns:
+            None if both are valid, otherwise a tuple of (error message, details)
+            listing the valid choices
+        """
+        if duck_type not in self.duck_types:
+            return f"Invalid duck type ({duck_type})", {
+                'duck_type': duck_type,
+                'available_types': self.list_duck_type_ids()
+            }
+        
+        if variant and variant not in self.duck_types[duck_type].get('variants', {}):
+            return f"Invalid variant ({variant}) for duck type ({duck_type})", {
+                'duck_type': duck_type,
+                'variant': variant,
+                'available_variants': self.list_variant_ids(duck_type)
+            }
+        
+        return None
+    
     def get_internal_name(self, duck_type: str, variant: str) -> Optional[str]:
         """Get the internal name for a duck type and variant."""
         variant_config = self.get_variant(duck_type, variant)
@@ -70,6 +148,27 @@ class DuckConfig:
             return variant_config.get('internal_name')
         return None
     
+    def _resolve_internal_name(self, duck_type: str, variant: Optional[str] = None) -> Optional[str]:
+        """
+        Resolve the internal name for a duck type and variant, falling back to
+        the first variant when no (valid) variant is given.
+        
+        Use the cached resolve_internal_name instead of calling this directly.
+        """
+        # If variant is provided, use it to get the internal name
+        if variant:
+            internal_name = self.get_internal_name(duck_type, variant)
+            if internal_name:
+                return internal_name
+        
+        # If no variant specified or variant not found, use the first variant's internal name as default
+        duck_type_config = self.get_duck_type(duck_type)
+        if duck_type_config and 'variants' in duck_type_config:
+            first_variant_id = next(iter(duck_type_config['variants'].keys()))
+            return self.get_internal_name(duck_type, first_variant_id)
+        
+        return None
+    
     def find_by_internal_name(self, internal_name: str) -> Optional[Dict[str, str]]:
         """Find the duck type and variant for a given internal name."""
         return self.internal_name_map.get(internal_name)
@@ -91,16 +190,30 @@ class DuckConfig:
         }
     
     def list_duck_types(self) -> List[Dict[str, Any]]:
-        """List all available duck types with basic information."""
-        result = []
-        for duck_id, config in self.duck_types.items():
-            result.append({
-                'id': duck_id,
-                'name': config.get('name', duck_id),
-                'description': config.get('description', ''),
-                'variants': list(config.get('variants', {}).keys())
-            })
-        return result
+        """
+        List all available duck types with basic information.
+        
+        The list is built once per (re)load and shared between callers, so it
+        must not be modified.
+        """
+        if self._duck_type_summaries is None:
+            result = []
+            for duck_id, config in self.duck_types.items():
+                result.append({
+                    'id': duck_id,
+                    'name': config.get('name', duck_id),
+                    'description': config.get('description', ''),
+                    'variants': list(config.get('variants', {}).keys())
+                })
+            self._duck_type_summaries = result
+            self._duck_type_ids = tuple(summary['id'] for summary in result)
+        return self._duck_type_summaries
+    
+    def list_duck_type_ids(self) -> Tuple[str, ...]:
+        """List the ids of all available duck types."""
+        if self._duck_type_summaries is None:
+            self.list_duck_types()
+        return self._duck_type_ids
     
     def list_all_variants(self) -> List[Dict[str, Any]]:
         """List all available variants across all duck types."""
@@ -124,17 +237,9 @@ class DuckConfig:
                 json.dump(config, f, indent=4)
             
             # Reload the configuration
-            self.duck_types[duck_type] = config
+            self._index_config(duck_type, config)
             
-            # Update internal name mapping
-            for variant_id, variant in config.get('variants', {}).items():
-                internal_name = variant.get('internal_name')
-                if internal_name:
-                    self.internal_name_map[internal_name] = {
-                        'duck_type': duck_type,
-                        'variant': variant_id
-                    }
-                    
+            self._run_reload_hooks()
             return True
         except Exception as e:
             print(f"Error saving duck configuration: {e}")
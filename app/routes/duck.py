@@ -1,18 +1,143 @@
-from flask import Blueprint, render_template, redirect, url_for, jsonify, request, send_file
+from flask import Blueprint, Response, render_template, redirect, url_for, request, send_file
 from datetime import datetime
 from pathlib import Path
-from ..config import TRAINED_MODELS_DIR, duck_config
+from werkzeug.exceptions import HTTPException
+from ..config import ROOT_DIR, TRAINED_MODELS_DIR, duck_config
 from ..services.open_duck_mini_playground import OpenDuckPlaygroundService
 from ..services.awd import AWDService
 from ..services.deployment import DeploymentService
 from ..services.reference_motion_generation import ReferenceMotionGenerationService
-from ..services.stl_to_glb import convert_stl_directory, get_stl_and_glb_files
+from ..services.stl_to_glb import convert_stl_directory, get_stl_and_glb_dirs, get_stl_and_glb_files
+from ..utils.files import scan_by_suffix
+from ..utils.jobs import JOBS, TRAIN_EXECUTOR, submit_device_job
+from ..utils.responses import conditional_json, conditional_page, debug_traceback, json_response
 import logging
-import traceback
 import os
 from typing import Optional
 import zipfile
 import io
+import functools
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from types import MappingProxyType
+import orjson
+
+# Shared read-only defaults so handlers don't rebuild literals on every request
+_EMPTY_DICT = MappingProxyType({})
+_DEFAULT_FEATURES = (
+    'Advanced walking dynamics',
+    'Real-time motion planning',
+    'Terrain adaptation',
+    'Energy optimization'
+)
+_DEFAULT_SPECIFICATIONS = (
+    MappingProxyType({'title': 'Height', 'value': '1.2m'}),
+    MappingProxyType({'title': 'Weight', 'value': '5kg'}),
+    MappingProxyType({'title': 'Battery Life', 'value': '4 hours'})
+)
+
+# File listings keyed by (kind, internal name): (cached at, dir mtime, digest,
+# files). Entries are reused while the listed directory is unchanged, for a
+# short while. The digest covers every listed path and timestamp, so it also
+# changes when files in subdirectories do.
+_LIST_CACHE = {}
+_LIST_CACHE_LOCK = threading.Lock()
+_LIST_CACHE_TTL = 2.0
+
+# Listings are scanned off the request thread. A request waits at most
+# _LIST_WAIT seconds when an older listing can be served instead; the scan
+# keeps running and refreshes the cache when done. Scans in flight are keyed
+# like the cache so concurrent requests share them.
+_LIST_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='duck-listing')
+_LIST_PENDING = {}
+_LIST_WAIT = 1.0
+
+# Motion generation runs off the request thread too. Runs share the
+# generator's working directory (it may write polynomial_coefficients.pkl
+# there), so they are also run one at a time.
+_MOTION_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix='duck-motion')
+
+
+@functools.cache
+def _duck_data_template(duck_type: str, variant_id: str) -> dict:
+    """
+    Return the duck data shared by all pages of a duck type and variant.
+    
+    The dict is cached and shared between requests; copy it before adding keys.
+    """
+    duck_type_config = duck_config.get_duck_type(duck_type)
+    return {
+        'name': duck_type_config.get('name', duck_type),
+        'type': duck_type,
+        'variant': duck_config.get_variant_summary(duck_type, variant_id)
+    }
+
+
+def _mtime_ns(path):
+    """Return the modification time of a path, or 0 if it does not exist."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only stream collecting bytes until they are taken with drain()."""
+    
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+    
+    def writable(self):
+        return True
+    
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _iter_zip(paths, chunk_size=1024 * 1024):
+    """Yield a zip archive of the given files as it is compressed.
+    
+    The archive is written to an unseekable sink, so zipfile emits each entry
+    with a trailing data descriptor and nothing has to be held in memory
+    beyond the current chunk.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        for path in paths:
+            try:
+                source = open(path, 'rb')
+            except FileNotFoundError:
+                continue
+            with source, zip_file.open(path.name, 'w') as entry:
+                while chunk := source.read(chunk_size):
+                    entry.write(chunk)
+                    yield sink.drain()
+            yield sink.drain()
+    # Central directory
+    yield sink.drain()
+
+
+duck_config.register_reload_hook(_duck_data_template.cache_clear)
+
+
+class DuckHTTPError(Exception):
+    """Error raised by duck route handlers, reported to the client as JSON."""
+    
+    def __init__(self, msg, status=400, details=None):
+        super().__init__(msg)
+        self.msg = msg
+        self.status = status
+        self.details = details
+
 
 class DuckBlueprint(Blueprint):
     """Blueprint for handling duck-related routes and views."""
@@ -23,32 +148,179 @@ class DuckBlueprint(Blueprint):
         self.logger = logging.getLogger(__name__)
         
         # Initialize services
-        self.workspace_root = Path(__file__).parent.parent.parent
+        self.workspace_root = ROOT_DIR
         self.playground_service = OpenDuckPlaygroundService(self.workspace_root)
         self.awd_service = AWDService(self.workspace_root)
         self.deployment_service = DeploymentService(self.workspace_root)
         self.motion_service = ReferenceMotionGenerationService(self.workspace_root)
         
-        # Register routes
+        # Service functions used to list files of each kind
+        self._list_functions = {
+            'motion': self.motion_service.list_motion_files,
+            'training': self.motion_service.list_training_files,
+            'testing': self.motion_service.list_testing_files
+        }
+        
+        # Connect function and request parameters (with defaults) per device type
+        self._connect_handlers = {
+            'serial': (self.deployment_service.connect_serial, {
+                'port': None,
+                'baudrate': 115200
+            }),
+            'ssh': (self.deployment_service.connect_ssh, {
+                'hostname': None,
+                'username': None,
+                'password': None,
+                'key_filename': None
+            })
+        }
+        
+        # Resolved on first use since url_for needs a request context
+        self._index_redirect_url = None
+        
+        # Register routes and the JSON error handlers shared by them
         self.register_routes()
+        self.register_error_handlers()
+        
+    def redirect_to_index(self):
+        """Redirect to the main dashboard."""
+        if self._index_redirect_url is None:
+            self._index_redirect_url = url_for('main.index')
+        return redirect(self._index_redirect_url)
+        
+    def cached_list(self, kind, internal_name):
+        """
+        List files of a kind for a duck, reusing a recent listing if its directory is unchanged.
+        
+        Returns:
+            Tuple of (listing digest, files)
+        """
+        return self.start_listing(kind, internal_name)()
+        
+    def start_listing(self, kind, internal_name):
+        """
+        Start listing files of a kind for a duck without waiting for the result.
+        
+        Lets a handler that needs several listings scan them concurrently.
+        
+        Returns:
+            Callable returning (listing digest, files) like cached_list
+        """
+        key = (kind, internal_name)
+        listing_dir = self.motion_service.listing_dir(kind, internal_name)
+        mtime = _mtime_ns(listing_dir) if listing_dir is not None else 0
+        now = time.monotonic()
+        
+        with _LIST_CACHE_LOCK:
+            entry = _LIST_CACHE.get(key)
+        if entry is not None:
+            cached_at, cached_mtime, digest, files = entry
+            if cached_mtime == mtime and now - cached_at < _LIST_CACHE_TTL:
+                return lambda: (digest, files)
+        
+        with _LIST_CACHE_LOCK:
+            future = _LIST_PENDING.get(key)
+            if future is None:
+                future = _LIST_EXECUTOR.submit(self._scan_listing, key, now, mtime)
+                _LIST_PENDING[key] = future
+        
+        if entry is None:
+            return future.result
+        
+        # The wait is measured from now, so listings started together share it
+        deadline = now + _LIST_WAIT
+        
+        def result():
+            try:
+                return future.result(timeout=max(deadline - time.monotonic(), 0))
+            except FuturesTimeoutError:
+                self.logger.warning("Listing %s files for %s is slow, serving the previous listing", kind, internal_name)
+                return entry[2], entry[3]
+        
+        return result
+        
+    def _scan_listing(self, key, now, mtime):
+        """List files for a cache key and store the result; runs on the listing pool."""
+        kind, internal_name = key
+        try:
+            files = self._list_functions[kind](internal_name)
+            digest = hashlib.blake2b(orjson.dumps(files), digest_size=16).hexdigest()
+            with _LIST_CACHE_LOCK:
+                _LIST_CACHE[key] = (now, mtime, digest, files)
+            return digest, files
+        finally:
+            with _LIST_CACHE_LOCK:
+                _LIST_PENDING.pop(key, None)
+        
+    def _debug_info(self, duck_type, variant, internal_name, include_headers=False):
+        """Describe the current request for debugging, or None when debug logging is off."""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return None
+        
+        debug_info = {
+            "url_path": request.path,
+            "duck_type": duck_type,
+            "variant": variant,
+            "internal_name": internal_name,
+            "request_args": dict(request.args)
+        }
+        if include_headers:
+            debug_info["request_headers"] = dict(request.headers)
+        return debug_info
         
     def get_trained_models(self, duck_type, variant):
         """Get list of trained models for a specific duck type and variant."""
         models_dir = TRAINED_MODELS_DIR / duck_type / variant
-        if not models_dir.exists():
-            return []
         
         models = []
-        for model_file in models_dir.glob('*.onnx'):
+        for model_file in scan_by_suffix(models_dir, '.onnx'):
             models.append({
                 'name': model_file.name,
-                'path': str(model_file),
+                'path': model_file.path,
                 'date': datetime.fromtimestamp(model_file.stat().st_mtime)
             })
         return sorted(models, key=lambda x: x['date'], reverse=True)
         
+    def register_error_handlers(self):
+        """Report errors raised by route handlers as JSON responses to API clients."""
+        
+        @self.errorhandler(DuckHTTPError)
+        def handle_duck_error(e):
+            payload = {'success': False, 'error': e.msg}
+            if e.details is not None:
+                payload['details'] = e.details
+            return json_response(payload, status=e.status)
+        
+        @self.errorhandler(Exception)
+        def handle_unexpected_error(e):
+            # Leave aborts and routing errors to Flask's default handling
+            if isinstance(e, HTTPException):
+                return e
+            
+            # Page requests keep Flask's HTML error page (and the debugger)
+            preferred = request.accept_mimetypes.best_match(('application/json', 'text/html'), 'application/json')
+            if preferred != 'application/json':
+                raise e
+            
+            self.logger.exception("Unhandled error in %s: %s", request.endpoint, e)
+            payload = {'success': False, 'error': str(e)}
+            error_traceback = debug_traceback(self.logger)
+            if error_traceback:
+                payload['details'] = {'traceback': error_traceback}
+            return json_response(payload, status=500)
+        
     def register_routes(self):
         """Register all routes for this blueprint."""
+        # Bound once here so the file-check and download handlers close over
+        # locals instead of looking the attributes up on every request
+        duck_type = self.name
+        logger = self.logger
+        motion_service = self.motion_service
+        require_internal_name = self.require_internal_name
+        cached_list = self.cached_list
+        start_listing = self.start_listing
+        debug_info_for = self._debug_info
+        list_kinds = tuple(self._list_functions)
         
         @self.route('/')
         def duck_page():
@@ -58,53 +330,43 @@ class DuckBlueprint(Blueprint):
             # Check if duck type exists in config
             duck_type_config = duck_config.get_duck_type(duck_type)
             if not duck_type_config:
-                self.logger.warning(f"Invalid duck type requested: {duck_type}")
-                return redirect(url_for('main.index'))
+                self.logger.warning("Invalid duck type requested: %s", duck_type)
+                return self.redirect_to_index()
             
             # Get the variant from query parameters, default to first variant
-            variants = duck_type_config.get('variants', {})
+            variants = duck_type_config.get('variants', _EMPTY_DICT)
             if not variants:
-                self.logger.warning(f"No variants found for duck type: {duck_type}")
-                return redirect(url_for('main.index'))
+                self.logger.warning("No variants found for duck type: %s", duck_type)
+                return self.redirect_to_index()
                 
-            variant_id = request.args.get('variant', list(variants.keys())[0])
+            variant_id = request.args.get('variant') or next(iter(variants))
             variant = variants.get(variant_id)
             
             if not variant:
-                self.logger.warning(f"Invalid variant requested: {variant_id} for duck type: {duck_type}")
-                return redirect(url_for('main.index'))
+                self.logger.warning("Invalid variant requested: %s for duck type: %s", variant_id, duck_type)
+                return self.redirect_to_index()
             
             # Create a duck object with all necessary information
-            duck_data = {
-                'name': duck_type_config.get('name', duck_type),
-                'type': duck_type,
-                'variant': {
-                    'id': variant_id,
-                    'name': variant.get('name', variant_id),
-                    'model_path': variant.get('model_path', ''),
-                    'description': variant.get('description', '')
-                },
-                'features': duck_type_config.get('features', [
-                    'Advanced walking dynamics',
-                    'Real-time motion planning',
-                    'Terrain adaptation',
-                    'Energy optimization'
-                ]),
-                'specifications': duck_type_config.get('specifications', [
-                    {'title': 'Height', 'value': '1.2m'},
-                    {'title': 'Weight', 'value': '5kg'},
-                    {'title': 'Battery Life', 'value': '4 hours'}
-                ]),
-            }
+            duck_data = _duck_data_template(duck_type, variant_id).copy()
+            duck_data['features'] = duck_type_config.get('features', _DEFAULT_FEATURES)
+            duck_data['specifications'] = duck_type_config.get('specifications', _DEFAULT_SPECIFICATIONS)
             
             # Get internal name for this duck type and variant
             duck_data['internal_name'] = self.get_internal_duck_name(duck_type, variant_id)
             
-            trained_models = self.get_trained_models(duck_type, variant_id)
-            return render_template('duck_page.html', 
-                                duck=duck_data,
-                                trained_models=trained_models,
-                                variants=variants)
+            def render():
+                trained_models = self.get_trained_models(duck_type, variant_id)
+                return render_template('duck_page.html', 
+                                    duck=duck_data,
+                                    trained_models=trained_models,
+                                    variants=variants)
+            
+            # The page only changes with the config or the trained models directory
+            models_dir = TRAINED_MODELS_DIR / duck_type / variant_id
+            return conditional_page(
+                (duck_type, variant_id, duck_config.version, _mtime_ns(models_dir)),
+                render
+            )
 
         @self.route('/stl_models')
         def stl_models():
@@ -115,47 +377,46 @@ class DuckBlueprint(Blueprint):
             # Get duck type config and validate
             duck_type_config = duck_config.get_duck_type(duck_type)
             if not duck_type_config:
-                self.logger.error(f"Invalid duck type: {duck_type}")
-                return redirect(url_for('main.index'))
+                self.logger.error("Invalid duck type: %s", duck_type)
+                return self.redirect_to_index()
             
             # Get variant info
-            variants = duck_type_config.get('variants', {})
+            variants = duck_type_config.get('variants', _EMPTY_DICT)
             if not variants:
-                self.logger.error(f"No variants found for duck type: {duck_type}")
-                return redirect(url_for('main.index'))
+                self.logger.error("No variants found for duck type: %s", duck_type)
+                return self.redirect_to_index()
             
             if not variant_id:
-                variant_id = list(variants.keys())[0]
+                variant_id = next(iter(variants))
             
             variant = variants.get(variant_id)
             if not variant:
-                self.logger.error(f"Invalid variant: {variant_id} for duck type: {duck_type}")
-                return redirect(url_for('main.index'))
-            
-            # Create duck data object
-            duck_data = {
-                'name': duck_type_config.get('name', duck_type),
-                'type': duck_type,
-                'variant': {
-                    'id': variant_id,
-                    'name': variant.get('name', variant_id),
-                    'model_path': variant.get('model_path', ''),
-                    'description': variant.get('description', '')
-                }
-            }
-            
-            # Get STL and GLB files
-            files = get_stl_and_glb_files(duck_type, variant_id)
-            
-            if not files['stl_files']:
-                self.logger.warning(f"No STL files found for {duck_type}")
-                # You might want to show a message to the user here
-            
-            return render_template('duck_droids/stl_models.html',
-                                duck=duck_data,
-                                stl_files=files['stl_files'],
-                                glb_files=files['glb_files'],
-                                variants=variants)
+                self.logger.error("Invalid variant: %s for duck type: %s", variant_id, duck_type)
+                return self.redirect_to_index()
+            
+            # Get the shared duck data object
+            duck_data = _duck_data_template(duck_type, variant_id)
+            
+            def render():
+                # Get STL and GLB files
+                files = get_stl_and_glb_files(duck_type, variant_id)
+                
+                if not files['stl_files']:
+                    self.logger.warning("No STL files found for %s", duck_type)
+                    # You might want to show a message to the user here
+                
+                return render_template('duck_droids/stl_models.html',
+                                    duck=duck_data,
+                                    stl_files=files['stl_files'],
+                                    glb_files=files['glb_files'],
+                                    variants=variants)
+            
+            # The page only changes with the config or the STL/GLB directories
+            stl_dir, glb_dir = get_stl_and_glb_dirs(duck_type, variant_id)
+            return conditional_page(
+                (duck_type, variant_id, duck_config.version, _mtime_ns(stl_dir), _mtime_ns(glb_dir)),
+                render
+            )
 
         @self.route('/convert_stl_to_glb', methods=['POST'])
         def convert_stl_to_glb():
@@ -167,10 +428,10 @@ class DuckBlueprint(Blueprint):
                 # Get duck type config
                 duck_type_config = duck_config.get_duck_type(duck_type)
                 if not duck_type_config:
-                    return jsonify({
+                    return json_response({
                         'success': False,
                         'message': f'Invalid duck type: {duck_type}'
-                    }), 400
+                    }, status=400)
                 
                 # Get STL directory from config or use default
                 stl_dir = Path(duck_type_config.get('stl_directory', 'open_duck_mini/print'))
@@ -189,24 +450,24 @@ class DuckBlueprint(Blueprint):
                 failed_files = [name for name, (success, _) in results.items() if not success]
                 
                 if failed_files:
-                    return jsonify({
+                    return json_response({
                         'success': False,
                         'message': f'Failed to convert some files: {", ".join(failed_files)}',
                         'results': results
-                    }), 400
+                    }, status=400)
                 
-                return jsonify({
+                return json_response({
                     'success': True,
                     'message': 'Successfully converted all STL files to GLB',
                     'results': results
                 })
                 
             except Exception as e:
-                self.logger.error(f"Error converting STL files: {str(e)}")
-                return jsonify({
+                self.logger.error("Error converting STL files: %s", e)
+                return json_response({
                     'success': False,
                     'message': f'Error converting STL files: {str(e)}'
-                }), 500
+                }, status=500)
 
         @self.route('/download_stl_bundle')
         def download_stl_bundle():
@@ -218,45 +479,36 @@ class DuckBlueprint(Blueprint):
                 # Get duck type config
                 duck_type_config = duck_config.get_duck_type(duck_type)
                 if not duck_type_config:
-                    return jsonify({
+                    return json_response({
                         'success': False,
                         'message': f'Invalid duck type: {duck_type}'
-                    }), 400
+                    }, status=400)
                 
                 # Get STL files
                 files = get_stl_and_glb_files(duck_type, variant_id)
                 stl_files = files['stl_files']
                 
                 if not stl_files:
-                    return jsonify({
+                    return json_response({
                         'success': False,
                         'message': 'No STL files found'
-                    }), 404
-                
-                # Create zip file in memory
-                zip_buffer = io.BytesIO()
-                with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                    for stl_file in stl_files:
-                        file_path = Path(stl_file['path'])
-                        if file_path.exists():
-                            zip_file.write(file_path, file_path.name)
+                    }, status=404)
                 
-                zip_buffer.seek(0)
-                
-                # Return zip file
-                return send_file(
-                    zip_buffer,
+                # Stream the zip while it is being built rather than buffering
+                # every STL file in memory first
+                paths = [Path(stl_file['path']) for stl_file in stl_files]
+                return Response(
+                    _iter_zip(paths),
                     mimetype='application/zip',
-                    as_attachment=True,
-                    download_name=f'{duck_type}_stl_files.zip'
+                    headers={'Content-Disposition': f'attachment; filename={duck_type}_stl_files.zip'}
                 )
                 
             except Exception as e:
-                self.logger.error(f"Error creating STL bundle: {str(e)}")
-                return jsonify({
+                self.logger.error("Error creating STL bundle: %s", e)
+                return json_response({
                     'success': False,
                     'message': f'Error creating STL bundle: {str(e)}'
-                }), 500
+                }, status=500)
 
         @self.route('/download_stl/<filename>')
         def download_stl(filename):
@@ -273,17 +525,17 @@ class DuckBlueprint(Blueprint):
                 stl_file = next((f for f in stl_files if f['name'] == filename), None)
                 
                 if not stl_file:
-                    return jsonify({
+                    return json_response({
                         'success': False,
                         'message': f'STL file not found: {filename}'
-                    }), 404
+                    }, status=404)
                 
                 file_path = Path(stl_file['path'])
                 if not file_path.exists():
-                    return jsonify({
+                    return json_response({
                         'success': False,
                         'message': f'STL file not found: {filename}'
-                    }), 404
+                    }, status=404)
                 
                 return send_file(
                     file_path,
@@ -293,11 +545,11 @@ class DuckBlueprint(Blueprint):
                 )
                 
             except Exception as e:
-                self.logger.error(f"Error downloading STL file: {str(e)}")
-                return jsonify({
+                self.logger.error("Error downloading STL file: %s", e)
+                return json_response({
                     'success': False,
                     'message': f'Error downloading STL file: {str(e)}'
-                }), 500
+                }, status=500)
 
         @self.route('/bom')
         def bom():
@@ -308,41 +560,35 @@ class DuckBlueprint(Blueprint):
             # Get duck type config and validate
             duck_type_config = duck_config.get_duck_type(duck_type)
             if not duck_type_config:
-                return redirect(url_for('main.index'))
+                return self.redirect_to_index()
             
             # Get variant info
-            variants = duck_type_config.get('variants', {})
+            variants = duck_type_config.get('variants', _EMPTY_DICT)
             if not variants:
-                return redirect(url_for('main.index'))
+                return self.redirect_to_index()
             
             if not variant_id:
-                variant_id = list(variants.keys())[0]
+                variant_id = next(iter(variants))
             
             variant = variants.get(variant_id)
             if not variant:
-                return redirect(url_for('main.index'))
-            
-            # Create duck data object
-            duck_data = {
-                'name': duck_type_config.get('name', duck_type),
-                'type': duck_type,
-                'variant': {
-                    'id': variant_id,
-                    'name': variant.get('name', variant_id),
-                    'model_path': variant.get('model_path', ''),
-                    'description': variant.get('description', '')
-                }
-            }
+                return self.redirect_to_index()
+            
+            # Get the shared duck data object
+            duck_data = _duck_data_template(duck_type, variant_id)
             
             # Get BOM data from config
             required_components = duck_type_config.get('required_components', [])
             optional_components = duck_type_config.get('optional_components', [])
             
-            return render_template('duck_droids/bom.html',
-                                duck=duck_data,
-                                required_components=required_components,
-                                optional_components=optional_components,
-                                variants=variants)
+            return conditional_page(
+                (duck_type, variant_id, duck_config.version),
+                lambda: render_template('duck_droids/bom.html',
+                                    duck=duck_data,
+                                    required_components=required_components,
+                                    optional_components=optional_components,
+                                    variants=variants)
+            )
 
         @self.route('/playground')
         def playground():
@@ -351,47 +597,38 @@ class DuckBlueprint(Blueprint):
             variant_id = request.args.get('variant')
             
             # Add detailed logging
-            self.logger.info(f"Rendering playground page for {duck_type} (variant: {variant_id})")
-            self.logger.debug(f"Request args: {request.args}")
+            self.logger.info("Rendering playground page for %s (variant: %s)", duck_type, variant_id)
+            self.logger.debug("Request args: %s", request.args)
             
             # Get duck type config and validate
             duck_type_config = duck_config.get_duck_type(duck_type)
             if not duck_type_config:
-                self.logger.warning(f"Invalid duck type requested: {duck_type}")
-                return redirect(url_for('main.index'))
+                self.logger.warning("Invalid duck type requested: %s", duck_type)
+                return self.redirect_to_index()
             
             # Get variant info
-            variants = duck_type_config.get('variants', {})
+            variants = duck_type_config.get('variants', _EMPTY_DICT)
             if not variants:
-                self.logger.warning(f"No variants found for duck type: {duck_type}")
-                return redirect(url_for('main.index'))
+                self.logger.warning("No variants found for duck type: %s", duck_type)
+                return self.redirect_to_index()
             
             if not variant_id:
-                variant_id = list(variants.keys())[0]
-                self.logger.info(f"No variant specified, using default: {variant_id}")
+                variant_id = next(iter(variants))
+                self.logger.info("No variant specified, using default: %s", variant_id)
             
             variant = variants.get(variant_id)
             if not variant:
-                self.logger.warning(f"Invalid variant requested: {variant_id} for duck type: {duck_type}")
-                return redirect(url_for('main.index'))
-            
-            self.logger.info(f"Using variant: {variant_id} ({variant.get('name', variant_id)})")
-            
-            # Create duck data object
-            duck_data = {
-                'name': duck_type_config.get('name', duck_type),
-                'type': duck_type,
-                'variant': {
-                    'id': variant_id,
-                    'name': variant.get('name', variant_id),
-                    'model_path': variant.get('model_path', ''),
-                    'description': variant.get('description', '')
-                }
-            }
+                self.logger.warning("Invalid variant requested: %s for duck type: %s", variant_id, duck_type)
+                return self.redirect_to_index()
+            
+            self.logger.info("Using variant: %s (%s)", variant_id, variant.get('name', variant_id))
+            
+            # Get the shared duck data object
+            duck_data = _duck_data_template(duck_type, variant_id)
             
             # Get trained models for this variant
             trained_models = self.get_trained_models(duck_type, variant_id)
-            self.logger.info(f"Found {len(trained_models)} trained models for variant {variant_id}")
+            self.logger.info("Found %s trained models for variant %s", len(trained_models), variant_id)
             
             return render_template('duck_droids/playground.html',
                                 duck=duck_data,
@@ -411,8 +648,8 @@ class DuckBlueprint(Blueprint):
                     data = request.get_json() or {}
                 
                 self.logger.info("----- Playground Launch Parameters -----")
-                self.logger.info(f"Request method: {request.method}")
-                self.logger.info(f"Request data: {data}")
+                self.logger.info("Request method: %s", request.method)
+                self.logger.info("Request data: %s", data)
                 
                 model = data.get('model', 'latest')
                 env = data.get('env', 'joystick')
@@ -420,26 +657,26 @@ class DuckBlueprint(Blueprint):
                 speed = int(data.get('speed', 50))
                 variant_id = data.get('variant')
                 
-                self.logger.info(f"Model: {model}")
-                self.logger.info(f"Environment: {env}")
-                self.logger.info(f"Task: {task}")
-                self.logger.info(f"Speed: {speed}")
-                self.logger.info(f"Variant ID: {variant_id}")
+                self.logger.info("Model: %s", model)
+                self.logger.info("Environment: %s", env)
+                self.logger.info("Task: %s", task)
+                self.logger.info("Speed: %s", speed)
+                self.logger.info("Variant ID: %s", variant_id)
                 
                 # Get the internal duck name
                 duck_type = self.get_internal_duck_name(self.name, variant_id)
-                self.logger.info(f"Using internal duck name: {duck_type}")
+                self.logger.info("Using internal duck name: %s", duck_type)
                 
                 if not duck_type:
                     error_msg = f"Could not determine internal duck name for {self.name}/{variant_id}"
                     self.logger.error(error_msg)
-                    return jsonify({'error': error_msg}), 400
+                    return json_response({'error': error_msg}, status=400)
                 
                 # First, let's check what models are available
                 available_models = self.playground_service.find_available_models(duck_type)
-                self.logger.info(f"Found {len(available_models)} available models")
+                self.logger.info("Found %s available models", len(available_models))
                 for model_info in available_models:
-                    self.logger.info(f"Model: {model_info}")
+                    self.logger.info("Model: %s", model_info)
                 
                 # Launch the playground
                 success, message, details = self.playground_service.launch_playground(
@@ -451,21 +688,20 @@ class DuckBlueprint(Blueprint):
                 )
                 
                 if not success:
-                    self.logger.error(f"Failed to launch playground: {message}")
-                    return jsonify({'error': message}), 400
+                    self.logger.error("Failed to launch playground: %s", message)
+                    return json_response({'error': message}, status=400)
                 
                 self.logger.info("Successfully launched playground")
-                return jsonify({
+                return json_response({
                     'message': message,
                     'details': details
                 })
                 
             except Exception as e:
-                self.logger.error(f"Error launching playground: {str(e)}")
-                self.logger.error(traceback.format_exc())
-                return jsonify({
+                self.logger.exception("Error launching playground: %s", e)
+                return json_response({
                     'error': f"Error launching playground: {str(e)}"
-                }), 500
+                }, status=500)
 
         @self.route('/training')
         def training():
@@ -476,32 +712,23 @@ class DuckBlueprint(Blueprint):
             # Get duck type config and validate
             duck_type_config = duck_config.get_duck_type(duck_type)
             if not duck_type_config:
-                return redirect(url_for('main.index'))
+                return self.redirect_to_index()
             
             # Get variant info
-            variants = duck_type_config.get('variants', {})
+            variants = duck_type_config.get('variants', _EMPTY_DICT)
             if not variants:
-                return redirect(url_for('main.index'))
+                return self.redirect_to_index()
             
-            # If no variant specified, try to get it from the session or default to first variant
+            # If no variant specified, default to first variant
             if not variant_id:
-                variant_id = request.args.get('variant', list(variants.keys())[0])
+                variant_id = next(iter(variants))
             
             variant = variants.get(variant_id)
             if not variant:
-                return redirect(url_for('main.index'))
-            
-            # Create duck data object
-            duck_data = {
-                'name': duck_type_config.get('name', duck_type),
-                'type': duck_type,
-                'variant': {
-                    'id': variant_id,
-                    'name': variant.get('name', variant_id),
-                    'model_path': variant.get('model_path', ''),
-                    'description': variant.get('description', '')
-                }
-            }
+                return self.redirect_to_index()
+            
+            # Get the shared duck data object
+            duck_data = _duck_data_template(duck_type, variant_id)
             
             # Get motion files for this variant
             internal_name = self.get_internal_duck_name(duck_type, variant_id)
@@ -521,31 +748,22 @@ class DuckBlueprint(Blueprint):
             # Get duck type config and validate
             duck_type_config = duck_config.get_duck_type(duck_type)
             if not duck_type_config:
-                return redirect(url_for('main.index'))
+                return self.redirect_to_index()
             
             # Get variant info
-            variants = duck_type_config.get('variants', {})
+            variants = duck_type_config.get('variants', _EMPTY_DICT)
             if not variants:
-                return redirect(url_for('main.index'))
+                return self.redirect_to_index()
             
             if not variant_id:
-                variant_id = list(variants.keys())[0]
+                variant_id = next(iter(variants))
             
             variant = variants.get(variant_id)
             if not variant:
-                return redirect(url_for('main.index'))
-            
-            # Create duck data object
-            duck_data = {
-                'name': duck_type_config.get('name', duck_type),
-                'type': duck_type,
-                'variant': {
-                    'id': variant_id,
-                    'name': variant.get('name', variant_id),
-                    'model_path': variant.get('model_path', ''),
-                    'description': variant.get('description', '')
-                }
-            }
+                return self.redirect_to_index()
+            
+            # Get the shared duck data object
+            duck_data = _duck_data_template(duck_type, variant_id)
             
             # Get trained models for this variant
             trained_models = self.get_trained_models(duck_type, variant_id)
@@ -564,31 +782,22 @@ class DuckBlueprint(Blueprint):
             # Get duck type config and validate
             duck_type_config = duck_config.get_duck_type(duck_type)
             if not duck_type_config:
-                return redirect(url_for('main.index'))
+                return self.redirect_to_index()
             
             # Get variant info
-            variants = duck_type_config.get('variants', {})
+            variants = duck_type_config.get('variants', _EMPTY_DICT)
             if not variants:
-                return redirect(url_for('main.index'))
+                return self.redirect_to_index()
             
             if not variant_id:
-                variant_id = list(variants.keys())[0]
+                variant_id = next(iter(variants))
             
             variant = variants.get(variant_id)
             if not variant:
-                return redirect(url_for('main.index'))
-            
-            # Create duck data object
-            duck_data = {
-                'name': duck_type_config.get('name', duck_type),
-                'type': duck_type,
-                'variant': {
-                    'id': variant_id,
-                    'name': variant.get('name', variant_id),
-                    'model_path': variant.get('model_path', ''),
-                    'description': variant.get('description', '')
-                }
-            }
+                return self.redirect_to_index()
+            
+            # Get the shared duck data object
+            duck_data = _duck_data_template(duck_type, variant_id)
             
             # Get troubleshooting data from config
             common_issues = duck_type_config.get('common_issues', [])
@@ -607,39 +816,33 @@ class DuckBlueprint(Blueprint):
             # Get duck type config and validate
             duck_type_config = duck_config.get_duck_type(duck_type)
             if not duck_type_config:
-                return redirect(url_for('main.index'))
+                return self.redirect_to_index()
             
             # Get variant info
-            variants = duck_type_config.get('variants', {})
+            variants = duck_type_config.get('variants', _EMPTY_DICT)
             if not variants:
-                return redirect(url_for('main.index'))
+                return self.redirect_to_index()
             
             if not variant_id:
-                variant_id = list(variants.keys())[0]
+                variant_id = next(iter(variants))
             
             variant = variants.get(variant_id)
             if not variant:
-                return redirect(url_for('main.index'))
-            
-            # Create duck data object
-            duck_data = {
-                'name': duck_type_config.get('name', duck_type),
-                'type': duck_type,
-                'variant': {
-                    'id': variant_id,
-                    'name': variant.get('name', variant_id),
-                    'model_path': variant.get('model_path', ''),
-                    'description': variant.get('description', '')
-                }
-            }
+                return self.redirect_to_index()
+            
+            # Get the shared duck data object
+            duck_data = _duck_data_template(duck_type, variant_id)
             
             # Get assembly steps from config
             assembly_steps = duck_type_config.get('assembly_steps', [])
             
-            return render_template('duck_droids/assembly.html',
-                                duck=duck_data,
-                                assembly_steps=assembly_steps,
-                                variants=variants)
+            return conditional_page(
+                (duck_type, variant_id, duck_config.version),
+                lambda: render_template('duck_droids/assembly.html',
+                                    duck=duck_data,
+                                    assembly_steps=assembly_steps,
+                                    variants=variants)
+            )
 
         @self.route('/train', methods=['POST'])
         def train_duck():
@@ -654,151 +857,188 @@ class DuckBlueprint(Blueprint):
                 # Get the internal duck name using duck_config
                 internal_name = self.get_internal_duck_name(self.name, variant)
                 if not internal_name:
-                    self.logger.error(f"Invalid duck type or variant: {self.name}/{variant}")
-                    return jsonify({
+                    self.logger.error("Invalid duck type or variant: %s/%s", self.name, variant)
+                    return json_response({
                         'success': False,
                         'message': f'Invalid duck type or variant: {self.name}/{variant}'
-                    }), 400
+                    }, status=400)
                 
-                self.logger.info(f"Starting training for {self.name} (variant: {variant}, internal: {internal_name}) with {framework}")
+                self.logger.info("Starting training for %s (variant: %s, internal: %s) with %s", self.name, variant, internal_name, framework)
                 
-                if framework == 'playground':
-                    success, message, output = self.playground_service.train_model(
-                        duck_type=internal_name,
-                        num_envs=num_envs,
-                        motion_file=motion_file
-                    )
-                else:
-                    success, message, output = self.awd_service.train_model(
-                        duck_type=internal_name,
-                        num_envs=num_envs,
-                        motion_file=motion_file
-                    )
-                    
-                return jsonify({
-                    'success': success,
-                    'message': message,
-                    'output': output
-                })
+                # Training is queued in the background and its result fetched
+                # from /train_jobs/<job_id>
+                service = self.playground_service if framework == 'playground' else self.awd_service
+                job_id = JOBS.submit('train', TRAIN_EXECUTOR, functools.partial(
+                    service.train_model,
+                    duck_type=internal_name,
+                    num_envs=num_envs,
+                    motion_file=motion_file
+                ))
+                
+                return json_response({
+                    'success': True,
+                    'job_id': job_id,
+                    'message': 'Training started'
+                }, status=202, headers={'Location': url_for('.get_train_job', job_id=job_id)})
                 
             except Exception as e:
-                import traceback
-                error_details = traceback.format_exc()
-                self.logger.error(f"Unexpected error in training: {str(e)}")
-                self.logger.error(f"Traceback: {error_details}")
-                return jsonify({
+                self.logger.exception("Unexpected error in training: %s", e)
+                details = {'error': str(e)}
+                error_traceback = debug_traceback(self.logger)
+                if error_traceback:
+                    details['traceback'] = error_traceback
+                return json_response({
                     'success': False,
                     'message': f'Error starting training: {str(e)}',
-                    'details': {
-                        'traceback': error_details,
-                        'error': str(e)
-                    }
-                }), 500
+                    'details': details
+                }, status=500)
+                
+        @self.route('/train_jobs/<job_id>', methods=['GET'])
+        def get_train_job(job_id):
+            """Get the status, and once finished the result, of a training job."""
+            # Finished jobs are reported once and then forgotten
+            job = JOBS.get('train', job_id)
+            if job is None:
+                raise DuckHTTPError(f'Unknown job: {job_id}', status=404)
+            
+            future, _ = job
+            if not future.done():
+                return json_response({
+                    'success': True,
+                    'done': False,
+                    'message': 'Training still running' if future.running() else 'Training queued'
+                })
+            
+            try:
+                success, message, output = future.result()
+            except Exception as e:
+                self.logger.exception("Unexpected error in training: %s", e)
+                details = {'error': str(e)}
+                error_traceback = debug_traceback(self.logger)
+                if error_traceback:
+                    details['traceback'] = error_traceback
+                return json_response({
+                    'success': False,
+                    'done': True,
+                    'message': f'Error during training: {str(e)}',
+                    'details': details
+                })
+            
+            return json_response({
+                'success': success,
+                'done': True,
+                'message': message,
+                'output': output
+            })
                 
         @self.route('/generate_motion', methods=['POST'])
         def generate_motion():
-            """Generate motion for a specific duck type."""
+            """Start generating motion for a specific duck type."""
             try:
                 # Debug incoming request
-                self.logger.debug(f"Incoming motion generation request for duck type: {self.name}")
-                self.logger.debug(f"Request form data: {request.form}")
-                self.logger.debug(f"Request args: {request.args}")
+                self.logger.debug("Incoming motion generation request for duck type: %s", self.name)
+                self.logger.debug("Request form data: %s", request.form)
+                self.logger.debug("Request args: %s", request.args)
                 
                 # Handle form data instead of JSON
                 data = request.form.to_dict()
                 variant = request.args.get('variant')
-                mode = data.get('mode', 'auto')
+                # Mode is passed to the service separately from the other parameters
+                mode = data.pop('mode', 'auto')
                 
-                self.logger.info(f"Processing motion generation request - Duck: {self.name}, Variant: {variant}, Mode: {mode}")
-                self.logger.debug(f"Form parameters: {data}")
+                self.logger.info("Processing motion generation request - Duck: %s, Variant: %s, Mode: %s", self.name, variant, mode)
+                self.logger.debug("Form parameters: %s", data)
                 
                 # Validate duck type and variant
-                if not duck_config.get_duck_type(self.name):
-                    error_msg = f"Invalid duck type ({self.name})"
-                    self.logger.error(error_msg)
-                    return jsonify({
-                        'success': False,
-                        'error': error_msg,
-                        'details': {
-                            'duck_type': self.name,
-                            'available_types': [dt['id'] for dt in duck_config.list_duck_types()]
-                        }
-                    }), 400
-                
-                if variant and not duck_config.get_variant(self.name, variant):
-                    error_msg = f"Invalid variant ({variant}) for duck type ({self.name})"
-                    self.logger.error(error_msg)
-                    duck_type_config = duck_config.get_duck_type(self.name)
-                    return jsonify({
-                        'success': False,
-                        'error': error_msg,
-                        'details': {
-                            'duck_type': self.name,
-                            'variant': variant,
-                            'available_variants': list(duck_type_config.get('variants', {}).keys())
-                        }
-                    }), 400
-                
-                # Get internal duck name
-                internal_name = self.get_internal_duck_name(self.name, variant)
-                if not internal_name:
-                    error_msg = f"Could not determine internal name for {self.name}/{variant}"
-                    self.logger.error(error_msg)
-                    return jsonify({
-                        'success': False,
-                        'error': error_msg
-                    }), 400
+                internal_name = self.require_internal_name(self.name, variant)
                 
-                self.logger.info(f"Using internal duck name: {internal_name}")
+                self.logger.info("Using internal duck name: %s", internal_name)
                 
-                # Remove mode from data since we're passing it separately
-                if 'mode' in data:
-                    del data['mode']
-                    
-                # Call the service with all the parameters
-                self.logger.debug(f"Calling motion service with params: duck_type={internal_name}, mode={mode}, and {len(data)} additional parameters")
-                success, message, output = self.motion_service.generate_motion(
+                # Generation runs for a while, so it is started in the background
+                # and its result fetched from /motion_jobs/<job_id>
+                self.logger.debug("Calling motion service with params: duck_type=%s, mode=%s, and %d additional parameters", internal_name, mode, len(data))
+                job_id = JOBS.submit('motion', _MOTION_EXECUTOR, functools.partial(
+                    self.motion_service.generate_motion,
                     duck_type=internal_name,
                     mode=mode,
                     **data  # Pass remaining form data as params
-                )
+                ))
                 
-                self.logger.debug(f"Service returned: success={success}, message={message}")
-                
-                if not success:
-                    self.logger.error(f"Motion generation failed: {message}")
-                    if output and isinstance(output, dict):
-                        self.logger.error(f"Error details: {output}")
-                    return jsonify({
-                        'success': False,
-                        'error': message,  # Using 'error' instead of 'message' to match frontend expectations
-                        'details': output
-                    })
-                
-                self.logger.info(f"Motion generation completed successfully")
-                return jsonify({
-                    'success': success,
-                    'message': message,
-                    'motion_data': output  # Change 'output' to 'motion_data' to match frontend expectation
-                })
+                return json_response({
+                    'success': True,
+                    'job_id': job_id,
+                    'message': 'Motion generation started'
+                }, status=202, headers={'Location': url_for('.get_motion_job', job_id=job_id)})
                 
+            except DuckHTTPError:
+                raise
             except Exception as e:
-                import traceback
-                error_details = traceback.format_exc()
-                self.logger.error(f"Unexpected error in motion generation: {str(e)}")
-                self.logger.error(f"Traceback: {error_details}")
-                return jsonify({
+                self.logger.exception("Unexpected error in motion generation: %s", e)
+                details = {'error': str(e)}
+                error_traceback = debug_traceback(self.logger)
+                if error_traceback:
+                    details['traceback'] = error_traceback
+                return json_response({
                     'success': False,
                     'error': f"Error generating motion: {str(e)}",  # Using 'error' instead of 'message'
-                    'details': {
-                        'traceback': error_details,
-                        'error': str(e)
-                    }
+                    'details': details
                 })
+        
+        @self.route('/motion_jobs/<job_id>', methods=['GET'])
+        def get_motion_job(job_id):
+            """Get the status, and once finished the result, of a motion generation job."""
+            # Finished jobs are reported once and then forgotten
+            job = JOBS.get('motion', job_id)
+            if job is None:
+                raise DuckHTTPError(f'Unknown job: {job_id}', status=404)
+            
+            future, _ = job
+            if not future.done():
+                return json_response({
+                    'success': True,
+                    'done': False,
+                    'message': 'Motion generation still running'
+                })
+            
+            try:
+                success, message, output = future.result()
+            except Exception as e:
+                self.logger.exception("Unexpected error in motion generation: %s", e)
+                details = {'error': str(e)}
+                error_traceback = debug_traceback(self.logger)
+                if error_traceback:
+                    details['traceback'] = error_traceback
+                return json_response({
+                    'success': False,
+                    'done': True,
+                    'error': f"Error generating motion: {str(e)}",
+                    'details': details
+                })
+            
+            self.logger.debug("Service returned: success=%s, message=%s", success, message)
+            
+            if not success:
+                self.logger.error("Motion generation failed: %s", message)
+                if output and isinstance(output, dict):
+                    self.logger.error("Error details: %s", output)
+                return json_response({
+                    'success': False,
+                    'done': True,
+                    'error': message,  # Using 'error' instead of 'message' to match frontend expectations
+                    'details': output
+                })
+            
+            self.logger.info("Motion generation completed successfully")
+            return json_response({
+                'success': success,
+                'done': True,
+                'message': message,
+                'motion_data': output  # Change 'output' to 'motion_data' to match frontend expectation
+            })
                 
         @self.route('/deploy', methods=['POST'])
         def deploy_duck():
-            """Deploy a model to a duck device."""
+            """Start deploying a model to a duck device."""
             try:
                 data = request.get_json()
                 variant = data.get('variant')
@@ -806,61 +1046,90 @@ class DuckBlueprint(Blueprint):
                 remote_path = data.get('remote_path')
                 device_type = data.get('device_type', 'serial')
                 
-                success, message = self.deployment_service.deploy_model(
+                job_id = submit_device_job(
+                    'Error deploying model',
+                    self.deployment_service.deploy_model,
                     model_path=model_path,
                     remote_path=remote_path,
                     device_type=device_type
                 )
                 
-                return jsonify({
-                    'success': success,
-                    'message': message
-                })
+                return json_response({
+                    'success': True,
+                    'message': 'Deployment started',
+                    'job_id': job_id
+                }, status=202, headers={'Location': url_for('.get_device_job', job_id=job_id)})
                 
             except Exception as e:
-                return jsonify({
+                return json_response({
                     'success': False,
                     'message': f'Error deploying model: {str(e)}'
                 })
                 
         @self.route('/connect', methods=['POST'])
         def connect_duck():
-            """Connect to a duck device."""
+            """Start connecting to a duck device."""
             try:
                 data = request.get_json()
                 variant = data.get('variant')
                 device_type = data.get('device_type', 'serial')
                 
-                if device_type == 'serial':
-                    port = data.get('port')
-                    baudrate = data.get('baudrate', 115200)
-                    success, message = self.deployment_service.connect_serial(
-                        port=port,
-                        baudrate=baudrate
-                    )
-                else:
-                    hostname = data.get('hostname')
-                    username = data.get('username')
-                    password = data.get('password')
-                    key_filename = data.get('key_filename')
-                    success, message = self.deployment_service.connect_ssh(
-                        hostname=hostname,
-                        username=username,
-                        password=password,
-                        key_filename=key_filename
-                    )
+                connector = self._connect_handlers.get(device_type)
+                if connector is None:
+                    return json_response({
+                        'success': False,
+                        'message': f'Unknown device type: {device_type}'
+                    }, status=400)
+                
+                connect, params = connector
+                job_id = submit_device_job(
+                    'Error connecting to device',
+                    connect,
+                    **{name: data.get(name, default) for name, default in params.items()}
+                )
                     
-                return jsonify({
-                    'success': success,
-                    'message': message
-                })
+                return json_response({
+                    'success': True,
+                    'message': 'Connection started',
+                    'job_id': job_id
+                }, status=202, headers={'Location': url_for('.get_device_job', job_id=job_id)})
                 
             except Exception as e:
-                return jsonify({
+                return json_response({
                     'success': False,
                     'message': f'Error connecting to device: {str(e)}'
                 })
                 
+        @self.route('/device_jobs/<job_id>', methods=['GET'])
+        def get_device_job(job_id):
+            """Get the result of a deploy or connect job."""
+            # Finished jobs are reported once and then forgotten
+            job = JOBS.get('device', job_id)
+            if job is None:
+                return json_response({
+                    'success': False,
+                    'message': f'Unknown job: {job_id}'
+                }, status=404)
+            
+            future, error_prefix = job
+            if not future.done():
+                return json_response({
+                    'success': True,
+                    'done': False,
+                    'message': 'Job still running'
+                })
+            
+            try:
+                success, message = future.result()
+            except Exception as e:
+                success, message = False, f'{error_prefix}: {str(e)}'
+            
+            return json_response({
+                'success': success,
+                'done': True,
+                'message': message
+            })
+                
         @self.route('/status', methods=['GET'])
         def get_duck_status():
             """Get status of a duck device."""
@@ -869,234 +1138,63 @@ class DuckBlueprint(Blueprint):
                 device_type = request.args.get('device_type', 'serial')
                 success, message, status = self.deployment_service.get_device_status(device_type)
                 
-                return jsonify({
+                return json_response({
                     'success': success,
                     'message': message,
                     'status': status
                 })
                 
             except Exception as e:
-                return jsonify({
+                return json_response({
                     'success': False,
                     'message': f'Error getting device status: {str(e)}'
                 })
 
-        @self.route('/check_motion_files', methods=['GET'])
-        def check_motion_files():
-            """Check if motion files are available for the current duck type."""
-            try:
+        def make_check_files(kind):
+            """Build the handler reporting which files of a kind are available."""
+            def check_files():
                 variant = request.args.get('variant', None)
-                duck_type = request.path.split('/')[1]
-                self.logger.debug(f"check_motion_files called for {duck_type} (variant: {variant})")
+                logger.debug("check_%s_files called for %s (variant: %s)", kind, duck_type, variant)
                 
-                # Validate duck type and variant
-                if not duck_config.get_duck_type(duck_type):
-                    error_msg = f"Invalid duck type ({duck_type})"
-                    self.logger.error(error_msg)
-                    return jsonify({
-                        'success': False,
-                        'error': error_msg,
-                        'details': {
-                            'duck_type': duck_type,
-                            'available_types': [dt['id'] for dt in duck_config.list_duck_types()]
-                        }
-                    }), 400
-                
-                if variant and not duck_config.get_variant(duck_type, variant):
-                    error_msg = f"Invalid variant ({variant}) for duck type ({duck_type})"
-                    self.logger.error(error_msg)
-                    duck_type_config = duck_config.get_duck_type(duck_type)
-                    return jsonify({
-                        'success': False,
-                        'error': error_msg,
-                        'details': {
-                            'duck_type': duck_type,
-                            'variant': variant,
-                            'available_variants': list(duck_type_config.get('variants', {}).keys())
-                        }
-                    }), 400
-                
-                # Get internal name based on duck_type and variant
-                internal_name = self.get_internal_duck_name(duck_type, variant)
-                if not internal_name:
-                    error_msg = f"Could not determine internal name for {duck_type}/{variant}"
-                    self.logger.error(error_msg)
-                    return jsonify({
-                        'success': False,
-                        'error': error_msg
-                    }), 400
-                    
-                self.logger.debug(f"Mapped to internal duck name: {internal_name}")
+                internal_name = require_internal_name(duck_type, variant)
+                logger.debug("Mapped to internal duck name: %s", internal_name)
                 
                 # Log request details for debugging
-                debug_info = {
-                    "url_path": request.path,
-                    "duck_type": duck_type,
-                    "variant": variant,
-                    "internal_name": internal_name,
-                    "request_args": dict(request.args),
-                    "request_headers": dict(request.headers)
-                }
-                self.logger.debug(f"Request details: {debug_info}")
-                
-                # Check for motion files
-                files = self.motion_service.list_motion_files(internal_name)
-                self.logger.debug(f"Found motion files: {files}")
-                
-                return jsonify({
-                    "success": True,
-                    "files": files,
-                    "debug_info": debug_info
-                })
-            except Exception as e:
-                import traceback
-                self.logger.error(f"Error checking motion files: {str(e)}", exc_info=True)
-                return jsonify({
-                    "success": False,
-                    "error": str(e),
-                    "debug_info": {
-                        "exception": str(e),
-                        "traceback": traceback.format_exc()
-                    }
-                })
-        
-        @self.route('/check_training_files', methods=['GET'])
-        def check_training_files():
-            """Check if training files are available for the current duck type."""
-            try:
-                variant = request.args.get('variant', None)
-                duck_type = request.path.split('/')[1]
-                self.logger.debug(f"check_training_files called for {duck_type} (variant: {variant})")
+                debug_info = debug_info_for(duck_type, variant, internal_name, include_headers=True)
+                logger.debug("Request details: %s", debug_info)
                 
-                # Validate duck type and variant
-                if not duck_config.get_duck_type(duck_type):
-                    error_msg = f"Invalid duck type ({duck_type})"
-                    self.logger.error(error_msg)
-                    return jsonify({
-                        'success': False,
-                        'error': error_msg,
-                        'details': {
-                            'duck_type': duck_type,
-                            'available_types': [dt['id'] for dt in duck_config.list_duck_types()]
-                        }
-                    }), 400
-                
-                if variant and not duck_config.get_variant(duck_type, variant):
-                    error_msg = f"Invalid variant ({variant}) for duck type ({duck_type})"
-                    self.logger.error(error_msg)
-                    duck_type_config = duck_config.get_duck_type(duck_type)
-                    return jsonify({
-                        'success': False,
-                        'error': error_msg,
-                        'details': {
-                            'duck_type': duck_type,
-                            'variant': variant,
-                            'available_variants': list(duck_type_config.get('variants', {}).keys())
-                        }
-                    }), 400
-                
-                # Get internal name based on duck_type and variant
-                internal_name = self.get_internal_duck_name(duck_type, variant)
-                if not internal_name:
-                    error_msg = f"Could not determine internal name for {duck_type}/{variant}"
-                    self.logger.error(error_msg)
-                    return jsonify({
-                        'success': False,
-                        'error': error_msg
-                    }), 400
-                    
-                self.logger.debug(f"Mapped to internal duck name: {internal_name}")
-                
-                # Debug info
-                debug_info = {
-                    "url_path": request.path,
-                    "duck_type": duck_type,
-                    "variant": variant,
-                    "internal_name": internal_name,
-                    "request_args": dict(request.args)
-                }
-                
-                # Check for training files
-                files = self.motion_service.list_training_files(internal_name)
-                self.logger.debug(f"Found training files: {files}")
-                
-                return jsonify({
+                digest, files = cached_list(kind, internal_name)
+                logger.debug("Found %s files: %s", kind, files)
+                
+                # Pollers get an empty 304 while the listing is unchanged
+                return conditional_json((kind, internal_name, digest), lambda: {
                     "success": True,
+                    "message": f"Found {len(files)} {kind} files",
                     "files": files,
-                    "debug_info": debug_info
-                })
-            except Exception as e:
-                import traceback
-                self.logger.error(f"Error checking training files: {str(e)}", exc_info=True)
-                return jsonify({
-                    "success": False,
-                    "error": str(e),
-                    "debug_info": {
-                        "exception": str(e),
-                        "traceback": traceback.format_exc()
-                    }
+                    **({"debug_info": debug_info} if debug_info else {})
                 })
+            return check_files
         
-        @self.route('/check_testing_files', methods=['GET'])
-        def check_testing_files():
-            """Check if testing files are available for the current duck type."""
-            try:
-                variant = request.args.get('variant', None)
-                duck_type = request.path.split('/')[1]
-                self.logger.debug(f"check_testing_files called for {duck_type} (variant: {variant})")
-                
-                # Validate duck type and variant
-                if not duck_config.get_duck_type(duck_type):
-                    error_msg = f"Invalid duck type ({duck_type})"
-                    self.logger.error(error_msg)
-                    return jsonify({
-                        'success': False,
-                        'error': error_msg,
-                        'details': {
-                            'duck_type': duck_type,
-                            'available_types': [dt['id'] for dt in duck_config.list_duck_types()]
-                        }
-                    }), 400
-                
-                if variant and not duck_config.get_variant(duck_type, variant):
-                    error_msg = f"Invalid variant ({variant}) for duck type ({duck_type})"
-                    self.logger.error(error_msg)
-                    duck_type_config = duck_config.get_duck_type(duck_type)
-                    return jsonify({
-                        'success': False,
-                        'error': error_msg,
-                        'details': {
-                            'duck_type': duck_type,
-                            'variant': variant,
-                            'available_variants': list(duck_type_config.get('variants', {}).keys())
-                        }
-                    }), 400
-                
-                # Get internal name based on duck_type and variant
-                internal_name = self.get_internal_duck_name(duck_type, variant)
-                if not internal_name:
-                    error_msg = f"Could not determine internal name for {duck_type}/{variant}"
-                    self.logger.error(error_msg)
-                    return jsonify({
-                        'success': False,
-                        'error': error_msg
-                    }), 400
-                
-                # Check for testing files
-                success, message, files = self.motion_service.check_testing_files(internal_name)
-                
-                return jsonify({
-                    'success': success,
-                    'message': message,
-                    'files': files
-                })
-                
-            except Exception as e:
-                self.logger.error(f"Error checking testing files: {str(e)}")
-                return jsonify({
-                    'success': False,
-                    'error': str(e)
-                }), 500
+        for kind in ('motion', 'training', 'testing'):
+            self.add_url_rule(f'/check_{kind}_files', f'check_{kind}_files',
+                              make_check_files(kind), methods=['GET'])
+        
+        @self.route('/check_all_files', methods=['GET'])
+        def check_all_files():
+            """Report the motion, training and testing files available, in one response."""
+            variant = request.args.get('variant', None)
+            internal_name = require_internal_name(duck_type, variant)
+            
+            # Start every listing before waiting on any, so slow scans overlap
+            pending = {kind: start_listing(kind, internal_name) for kind in list_kinds}
+            listings = {kind: result() for kind, result in pending.items()}
+            etag_parts = (internal_name,) + tuple(
+                (kind, digest) for kind, (digest, _) in listings.items()
+            )
+            return conditional_json(etag_parts, lambda: {
+                "success": True,
+                "files": {kind: files for kind, (_, files) in listings.items()}
+            })
 
         @self.route('/launch_gait_playground', methods=['POST'])
         def launch_gait_playground():
@@ -1108,10 +1206,10 @@ class DuckBlueprint(Blueprint):
                 # Get the internal name using duck_config
                 internal_name = self.get_internal_duck_name(self.name, variant)
                 if not internal_name:
-                    return jsonify({
+                    return json_response({
                         'success': False,
                         'message': f'Invalid duck type or variant: {self.name}/{variant}'
-                    }), 400
+                    }, status=400)
                 
                 # Launch the playground
                 success, message, data = self.motion_service.gait_playground(
@@ -1119,111 +1217,91 @@ class DuckBlueprint(Blueprint):
                     variant=variant
                 )
                 
-                return jsonify({
+                return json_response({
                     'success': success,
                     'message': message,
                     'data': data
                 })
             except Exception as e:
-                self.logger.error(f"Error launching playground for {self.name}: {str(e)}")
-                return jsonify({
+                self.logger.error("Error launching playground for %s: %s", self.name, e)
+                return json_response({
                     'success': False,
                     'message': f"Error launching playground: {str(e)}"
-                }), 500
+                }, status=500)
 
-        @self.route('/download_motion', methods=['POST'])
+        @self.route('/download_motion', methods=['GET', 'POST'])
         def download_motion():
             """Download the latest generated motion file."""
+            variant = request.args.get('variant')
+            
+            # Validate duck type and variant
+            internal_name = require_internal_name(duck_type, variant)
+            
+            logger.info("Downloading motion file for %s/%s (internal: %s)", duck_type, variant, internal_name)
+            
+            # Find the most recent motion file
+            latest_file = motion_service.get_latest_motion_file(internal_name)
+            if latest_file is None:
+                raise DuckHTTPError('No motion files available', status=404)
+            
+            logger.info("Downloading motion file: %s", latest_file['path'])
+            
+            # Return the file as an attachment. The absolute path came from
+            # scanning the duck's motion directory, so it needs no further
+            # validation; the file is only missing if it was removed since.
             try:
-                variant = request.args.get('variant')
-                
-                # Validate duck type and variant
-                if not duck_config.get_duck_type(self.name):
-                    error_msg = f"Invalid duck type ({self.name})"
-                    self.logger.error(error_msg)
-                    return jsonify({
-                        'success': False,
-                        'error': error_msg
-                    }), 400
-                
-                if variant and not duck_config.get_variant(self.name, variant):
-                    error_msg = f"Invalid variant ({variant}) for duck type ({self.name})"
-                    self.logger.error(error_msg)
-                    return jsonify({
-                        'success': False,
-                        'error': error_msg
-                    }), 400
-                
-                # Get internal name
-                internal_name = self.get_internal_duck_name(self.name, variant)
-                if not internal_name:
-                    error_msg = f"Could not determine internal name for {self.name}/{variant}"
-                    self.logger.error(error_msg)
-                    return jsonify({
-                        'success': False,
-                        'error': error_msg
-                    }), 400
-                
-                self.logger.info(f"Downloading motion file for {self.name}/{variant} (internal: {internal_name})")
-                
-                # Find the latest motion file
-                motion_files = self.motion_service.list_motion_files(internal_name)
-                
-                if not motion_files:
-                    return jsonify({
-                        'success': False,
-                        'error': 'No motion files available'
-                    }), 404
-                
-                # Get the most recent file
-                latest_file = motion_files[0]
-                file_path = self.workspace_root / latest_file['path']
-                
-                if not file_path.exists():
-                    self.logger.error(f"Motion file does not exist: {file_path}")
-                    return jsonify({
-                        'success': False,
-                        'error': 'Motion file not found'
-                    }), 404
-                
-                self.logger.info(f"Downloading motion file: {file_path}")
-                
-                # Return the file as an attachment
-                return send_file(
-                    file_path,
+                response = send_file(
+                    latest_file['abs_path'],
                     as_attachment=True,
                     download_name=latest_file['name'],
-                    mimetype='application/json'
+                    mimetype='application/json',
+                    conditional=True,
+                    etag=True
                 )
-                
-            except Exception as e:
-                import traceback
-                self.logger.error(f"Error downloading motion file: {str(e)}")
-                self.logger.error(traceback.format_exc())
-                return jsonify({
-                    'success': False,
-                    'error': f'Error downloading motion file: {str(e)}'
-                }), 500
+            except FileNotFoundError:
+                logger.error("Motion file does not exist: %s", latest_file['path'])
+                raise DuckHTTPError('Motion file not found', status=404)
+            
+            # The latest file changes whenever motion is generated, so clients
+            # must revalidate; GETs with a matching Last-Modified/ETag get a 304
+            response.cache_control.no_cache = True
+            response.cache_control.max_age = None
+            return response
+
+    def require_internal_name(self, duck_type, variant):
+        """
+        Validate a duck type and optional variant and resolve the internal name.
+        
+        Returns:
+            The internal duck name
+            
+        Raises:
+            DuckHTTPError: If the duck type or variant is unknown, or no internal
+                name can be determined
+        """
+        error = duck_config.validation_error(duck_type, variant)
+        if error is not None:
+            error_msg, details = error
+            self.logger.error(error_msg)
+            raise DuckHTTPError(error_msg, details=details)
+        
+        # Get internal name based on duck_type and variant
+        internal_name = self.get_internal_duck_name(duck_type, variant)
+        if not internal_name:
+            error_msg = f"Could not determine internal name for {duck_type}/{variant}"
+            self.logger.error(error_msg)
+            raise DuckHTTPError(error_msg)
+        
+        return internal_name
 
     def get_internal_duck_name(self, duck_type: str, variant: str = None) -> Optional[str]:
         """Get the internal name for a duck type and variant."""
-        # If variant is provided, use it to get the internal name
-        if variant:
-            internal_name = duck_config.get_internal_name(duck_type, variant)
-            if internal_name:
-                self.logger.debug(f"Using internal name {internal_name} for variant {variant}")
-                return internal_name
-        
-        # If no variant specified or variant not found, use the first variant's internal name as default
-        duck_type_config = duck_config.get_duck_type(duck_type)
-        if duck_type_config and 'variants' in duck_type_config:
-            first_variant_id = next(iter(duck_type_config['variants'].keys()))
-            internal_name = duck_config.get_internal_name(duck_type, first_variant_id)
-            self.logger.debug(f"No variant specified, using first variant {first_variant_id} with internal name {internal_name}")
-            return internal_name
-            
-        self.logger.warning(f"Could not determine internal name for {duck_type}/{variant}")
-        return None
+        internal_name = duck_config.resolve_internal_name(duck_type, variant)
+        if internal_name is None:
+            self.logger.warning("Could not determine internal name for %s/%s", duck_type, variant)
+        return internal_name
+
 
-# Create blueprint instance
-duck = DuckBlueprint('duck', __name__) 
+def create_duck_blueprint(duck_type: str) -> DuckBlueprint:
+    """Create the blueprint serving a duck type's pages and API under /<duck_type>."""
+    return DuckBlueprint(duck_type, __name__, url_prefix=f'/{duck_type}')
@@ -1,10 +1,12 @@
-from flask import Blueprint, request, jsonify, current_app, url_for, render_template
-from pathlib import Path
+from flask import Blueprint, request, url_for
 from ..services.open_duck_mini_playground import OpenDuckPlaygroundService
 from ..services.awd import AWDService
 from ..services.deployment import DeploymentService
 from ..services.reference_motion_generation import ReferenceMotionGenerationService
-from ..config import duck_config, TRAINED_MODELS_DIR
+from ..config import ROOT_DIR, duck_config
+from ..utils.jobs import JOBS, TRAIN_EXECUTOR, submit_device_job
+from ..utils.responses import json_response
+import functools
 import os
 import logging
 
@@ -16,7 +18,7 @@ class DuckRoutes:
     
     def __init__(self, app):
         self.app = app
-        self.workspace_root = Path(app.root_path).parent
+        self.workspace_root = ROOT_DIR
         
         # Initialize services
         self.playground_service = OpenDuckPlaygroundService(self.workspace_root)
@@ -27,30 +29,29 @@ class DuckRoutes:
         # Register routes
         self.register_routes()
         
+    def submit_train_job(self, fn, **kwargs):
+        """Queue a training run in the background and return its job id."""
+        return JOBS.submit('train', TRAIN_EXECUTOR, functools.partial(fn, **kwargs))
+        
     def get_internal_duck_type(self, duck_type, variant=None):
         """Get the internal duck type name based on the URL path and variant."""
-        # If variant is provided, use it to get the internal name
-        if variant:
-            internal_name = duck_config.get_internal_name(duck_type, variant)
-            if internal_name:
-                return internal_name
-        
-        # If no variant specified or variant not found, use the first variant's internal name as default
-        duck_type_config = duck_config.get_duck_type(duck_type)
-        if duck_type_config and 'variants' in duck_type_config:
-            first_variant_id = next(iter(duck_type_config['variants'].keys()))
-            return duck_config.get_internal_name(duck_type, first_variant_id)
-            
-        return None
+        return duck_config.resolve_internal_name(duck_type, variant)
         
     def register_routes(self):
         """Register all routes for the application."""
+        # Bound once here so the handlers close over locals instead of
+        # looking the attributes up on every request
+        playground_service = self.playground_service
+        awd_service = self.awd_service
+        deployment_service = self.deployment_service
+        get_internal_duck_type = self.get_internal_duck_type
+        submit_train_job = self.submit_train_job
         
         # Duck type listing route
         @self.app.route('/api/duck_types', methods=['GET'])
         def list_duck_types():
             duck_types = duck_config.list_duck_types()
-            return jsonify({
+            return json_response({
                 'success': True,
                 'duck_types': duck_types
             })
@@ -60,10 +61,10 @@ class DuckRoutes:
         def list_variants(duck_type):
             duck_type_config = duck_config.get_duck_type(duck_type)
             if not duck_type_config:
-                return jsonify({
+                return json_response({
                     'success': False,
                     'error': f'Duck type {duck_type} not found'
-                }), 404
+                }, status=404)
                 
             variants = []
             for variant_id, variant in duck_type_config.get('variants', {}).items():
@@ -75,7 +76,7 @@ class DuckRoutes:
                     'model_path': variant.get('model_path', '')
                 })
                 
-            return jsonify({
+            return json_response({
                 'success': True,
                 'variants': variants
             })
@@ -93,12 +94,13 @@ class DuckRoutes:
                 env = data.get('env', 'joystick')
                 task = data.get('task', 'flat_terrain')
                 
-                internal_duck_type = self.get_internal_duck_type(duck_type, variant)
+                internal_duck_type = get_internal_duck_type(duck_type, variant)
                 if not internal_duck_type:
-                    return jsonify({'success': False, 'error': 'Invalid duck type or variant'}), 400
+                    return json_response({'success': False, 'error': 'Invalid duck type or variant'}, status=400)
                 
                 if framework == 'playground':
-                    success, message, output = self.playground_service.train_model(
+                    job_id = submit_train_job(
+                        playground_service.train_model,
                         duck_type=internal_duck_type,
                         num_envs=num_envs,
                         motion_file=motion_file,
@@ -106,111 +108,61 @@ class DuckRoutes:
                         task=task
                     )
                 else:
-                    success, message, output = self.awd_service.train_model(
+                    job_id = submit_train_job(
+                        awd_service.train_model,
                         duck_type=internal_duck_type,
                         num_envs=num_envs,
                         motion_file=motion_file
                     )
                     
-                return jsonify({
-                    'success': success,
-                    'message': message,
-                    'output': output
-                })
+                return json_response({
+                    'success': True,
+                    'job_id': job_id,
+                    'message': 'Training started'
+                }, status=202, headers={'Location': url_for('get_train_job', job_id=job_id)})
                 
             except Exception as e:
-                return jsonify({'success': False, 'error': str(e)}), 500
+                return json_response({'success': False, 'error': str(e)}, status=500)
+                
+        @self.app.route('/api/train_jobs/<job_id>', methods=['GET'])
+        def get_train_job(job_id):
+            """Get the status, and once finished the result, of a training job."""
+            # Finished jobs are reported once and then forgotten
+            job = JOBS.get('train', job_id)
+            if job is None:
+                return json_response({'success': False, 'error': f'Unknown job: {job_id}'}, status=404)
+            
+            future, _ = job
+            if not future.done():
+                return json_response({
+                    'success': True,
+                    'done': False,
+                    'message': 'Training still running' if future.running() else 'Training queued'
+                })
+            
+            try:
+                success, message, output = future.result()
+            except Exception as e:
+                return json_response({'success': False, 'done': True, 'error': str(e)})
+            
+            return json_response({
+                'success': success,
+                'done': True,
+                'message': message,
+                'output': output
+            })
                 
         # Get available environments and tasks
         @self.app.route('/api/playground/envs', methods=['GET'])
         def get_playground_envs():
             try:
-                envs = self.playground_service.get_available_envs()
-                return jsonify({
+                envs = playground_service.get_available_envs()
+                return json_response({
                     'success': True,
                     'environments': envs
                 })
             except Exception as e:
-                return jsonify({'success': False, 'error': str(e)}), 500
-
-        # Playground routes
-        @self.app.route('/<duck_type>/playground')
-        def playground(duck_type):
-            """Render the playground page for a specific duck type."""
-            try:
-                duck_type_config = duck_config.get_duck_type(duck_type)
-                if not duck_type_config:
-                    return render_template('error.html', message=f"Duck type {duck_type} not found"), 404
-                
-                # Get available models from trained models directory
-                model_dir = Path(TRAINED_MODELS_DIR) / duck_type
-                available_models = []
-                
-                if model_dir.exists():
-                    # Add latest and best options
-                    available_models.append({'id': 'latest', 'name': 'Latest Model'})
-                    available_models.append({'id': 'best', 'name': 'Best Model'})
-                    
-                    # Add all .onnx files
-                    for model_file in model_dir.glob('*.onnx'):
-                        available_models.append({
-                            'id': model_file.name,
-                            'name': model_file.stem
-                        })
-                    
-                return render_template('duck_droids/playground.html', 
-                                    duck_type=duck_type,
-                                    available_models=available_models)
-            except Exception as e:
-                logger.error(f"Error rendering playground for {duck_type}: {str(e)}")
-                return render_template('error.html', message="Error loading playground"), 500
-
-        @self.app.route('/<duck_type>/playground/launch')
-        def launch_playground(duck_type):
-            """Launch the Mujoco playground for a specific model."""
-            try:
-                # Get variant from query parameters
-                variant = request.args.get('variant')
-                
-                # Get the internal name using duck_config
-                internal_name = self.get_internal_duck_type(duck_type, variant)
-                if not internal_name:
-                    return jsonify({
-                        'success': False,
-                        'message': f'Invalid duck type or variant: {duck_type}/{variant}'
-                    }), 400
-                
-                model = request.args.get('model', 'latest')
-                env = request.args.get('env', 'joystick')
-                task = request.args.get('task', 'flat_terrain')
-                speed = int(request.args.get('speed', 50))  # Changed to int and default 50
-                
-                # First, let's check what models are available
-                available_models = self.playground_service.find_available_models(internal_name)
-                logger.info(f"Found {len(available_models)} available models")
-                for model_info in available_models:
-                    logger.info(f"Model: {model_info}")
-                
-                # Launch the playground
-                success, message, data = self.playground_service.launch_playground(
-                    duck_type=internal_name,
-                    model=model,
-                    env=env,
-                    task=task,
-                    speed=speed
-                )
-                
-                return jsonify({
-                    'success': success,
-                    'message': message,
-                    'data': data
-                })
-            except Exception as e:
-                logger.error(f"Error launching playground for {duck_type}: {str(e)}")
-                return jsonify({
-                    'success': False,
-                    'message': f"Error launching playground: {str(e)}"
-                }), 500
+                return json_response({'success': False, 'error': str(e)}, status=500)
 
         @self.app.route('/<duck_type>/playground/train')
         def train_model(duck_type):
@@ -220,12 +172,12 @@ class DuckRoutes:
                 variant = request.args.get('variant')
                 
                 # Get the internal name using duck_config
-                internal_name = self.get_internal_duck_type(duck_type, variant)
+                internal_name = get_internal_duck_type(duck_type, variant)
                 if not internal_name:
-                    return jsonify({
+                    return json_response({
                         'success': False,
                         'message': f'Invalid duck type or variant: {duck_type}/{variant}'
-                    }), 400
+                    }, status=400)
                 
                 # Get training parameters
                 env = request.args.get('env', 'joystick')
@@ -233,8 +185,9 @@ class DuckRoutes:
                 num_timesteps = int(request.args.get('num_timesteps', 150000000))
                 restore_checkpoint_path = request.args.get('restore_checkpoint_path')
                 
-                # Start training
-                success, message, data = self.playground_service.train_model(
+                # Start training in the background
+                job_id = submit_train_job(
+                    playground_service.train_model,
                     duck_type=internal_name,
                     env=env,
                     task=task,
@@ -242,112 +195,18 @@ class DuckRoutes:
                     restore_checkpoint_path=restore_checkpoint_path
                 )
                 
-                return jsonify({
-                    'success': success,
-                    'message': message,
-                    'data': data
-                })
+                return json_response({
+                    'success': True,
+                    'job_id': job_id,
+                    'message': 'Training started'
+                }, status=202, headers={'Location': url_for('get_train_job', job_id=job_id)})
             except Exception as e:
                 logger.error(f"Error starting training for {duck_type}: {str(e)}")
-                return jsonify({
+                return json_response({
                     'success': False,
                     'message': f"Error starting training: {str(e)}"
-                }), 500
+                }, status=500)
 
-        # Motion generation routes
-        @self.app.route('/<duck_type>/generate_motion', methods=['POST'])
-        def generate_motion(duck_type):
-            try:
-                data = request.form.to_dict()
-                variant = request.args.get('variant')
-                mode = data.get('mode', 'auto')
-                
-                # Enhanced logging
-                current_app.logger.info(f"Motion generation request received - Duck type: {duck_type}, Variant: {variant}, Mode: {mode}")
-                current_app.logger.debug(f"Request form data: {data}")
-                current_app.logger.debug(f"Request args: {request.args}")
-                current_app.logger.debug(f"Request headers: {dict(request.headers)}")
-                
-                # Get internal name from config
-                if not duck_config.get_duck_type(duck_type):
-                    error_msg = f"Invalid duck type ({duck_type})"
-                    current_app.logger.error(error_msg)
-                    return jsonify({
-                        'success': False,
-                        'error': error_msg,
-                        'details': {
-                            'duck_type': duck_type,
-                            'available_types': [dt['id'] for dt in duck_config.list_duck_types()]
-                        }
-                    }), 400
-                
-                if variant and not duck_config.get_variant(duck_type, variant):
-                    error_msg = f"Invalid variant ({variant}) for duck type ({duck_type})"
-                    current_app.logger.error(error_msg)
-                    duck_type_config = duck_config.get_duck_type(duck_type)
-                    return jsonify({
-                        'success': False,
-                        'error': error_msg,
-                        'details': {
-                            'duck_type': duck_type,
-                            'variant': variant,
-                            'available_variants': list(duck_type_config.get('variants', {}).keys())
-                        }
-                    }), 400
-
-                internal_name = self.get_internal_duck_type(duck_type, variant)
-                current_app.logger.info(f"Using internal duck name: {internal_name} (from {duck_type}:{variant})")
-                
-                # Log parameters being passed to the service
-                service_params = data.copy()
-                current_app.logger.debug(f"Calling motion_service.generate_motion with params: duck_type={internal_name}, mode={mode}, **{service_params}")
-                
-                success, message, motion_data = self.motion_service.generate_motion(
-                    duck_type=internal_name,
-                    variant=variant,
-                    mode=mode,
-                    **data
-                )
-                
-                if not success:
-                    current_app.logger.error(f"Motion generation failed: {message}")
-                    if motion_data and isinstance(motion_data, dict):
-                        current_app.logger.error(f"Detailed output: {motion_data}")
-                        return jsonify({
-                            'success': False,
-                            'error': message,
-                            'details': motion_data
-                        }), 500
-                    else:
-                        return jsonify({
-                            'success': False,
-                            'error': message,
-                            'details': {
-                                'error': str(motion_data) if motion_data else 'No additional details available'
-                            }
-                        }), 500
-                
-                current_app.logger.info(f"Motion generation successful: {message}")
-                return jsonify({
-                    'success': True,
-                    'message': message,
-                    'motion_data': motion_data
-                })
-                
-            except Exception as e:
-                import traceback
-                error_details = traceback.format_exc()
-                current_app.logger.error(f"Unexpected error in motion generation: {str(e)}")
-                current_app.logger.error(f"Traceback: {error_details}")
-                return jsonify({
-                    'success': False, 
-                    'error': str(e),
-                    'details': {
-                        'traceback': error_details,
-                        'error': str(e)
-                    }
-                }), 500
-                
         # Deployment routes
         @self.app.route('/api/deploy', methods=['POST'])
         def deploy_model():
@@ -357,19 +216,24 @@ class DuckRoutes:
                 remote_path = data.get('remote_path')
                 device_type = data.get('device_type', 'serial')
                 
-                success, message = self.deployment_service.deploy_model(
+                # Device I/O is queued with the duck pages' deploy and connect
+                # jobs, since they share one connection
+                job_id = submit_device_job(
+                    'Error deploying model',
+                    deployment_service.deploy_model,
                     model_path=model_path,
                     remote_path=remote_path,
                     device_type=device_type
                 )
                 
-                return jsonify({
-                    'success': success,
-                    'message': message
-                })
+                return json_response({
+                    'success': True,
+                    'message': 'Deployment started',
+                    'job_id': job_id
+                }, status=202, headers={'Location': url_for('get_device_job', job_id=job_id)})
                 
             except Exception as e:
-                return jsonify({
+                return json_response({
                     'success': False,
                     'message': f'Error deploying model: {str(e)}'
                 })
@@ -384,7 +248,9 @@ class DuckRoutes:
                 if device_type == 'serial':
                     port = data.get('port')
                     baudrate = data.get('baudrate', 115200)
-                    success, message = self.deployment_service.connect_serial(
+                    job_id = submit_device_job(
+                        'Error connecting to device',
+                        deployment_service.connect_serial,
                         port=port,
                         baudrate=baudrate
                     )
@@ -393,72 +259,69 @@ class DuckRoutes:
                     username = data.get('username')
                     password = data.get('password')
                     key_filename = data.get('key_filename')
-                    success, message = self.deployment_service.connect_ssh(
+                    job_id = submit_device_job(
+                        'Error connecting to device',
+                        deployment_service.connect_ssh,
                         hostname=hostname,
                         username=username,
                         password=password,
                         key_filename=key_filename
                     )
                     
-                return jsonify({
-                    'success': success,
-                    'message': message
-                })
+                return json_response({
+                    'success': True,
+                    'message': 'Connection started',
+                    'job_id': job_id
+                }, status=202, headers={'Location': url_for('get_device_job', job_id=job_id)})
                 
             except Exception as e:
-                return jsonify({
+                return json_response({
                     'success': False,
                     'message': f'Error connecting to device: {str(e)}'
                 })
                 
+        @self.app.route('/api/device_jobs/<job_id>', methods=['GET'])
+        def get_device_job(job_id):
+            """Get the result of a deploy or connect job."""
+            # Finished jobs are reported once and then forgotten
+            job = JOBS.get('device', job_id)
+            if job is None:
+                return json_response({'success': False, 'error': f'Unknown job: {job_id}'}, status=404)
+            
+            future, error_prefix = job
+            if not future.done():
+                return json_response({
+                    'success': True,
+                    'done': False,
+                    'message': 'Job still running'
+                })
+            
+            try:
+                success, message = future.result()
+            except Exception as e:
+                success, message = False, f'{error_prefix}: {e}'
+            
+            return json_response({
+                'success': success,
+                'done': True,
+                'message': message
+            })
+                
         # Device status route
         @self.app.route('/api/device_status', methods=['GET'])
         def get_device_status():
             try:
                 device_type = request.args.get('device_type', 'serial')
-                success, message, status = self.deployment_service.get_device_status(device_type)
+                success, message, status = deployment_service.get_device_status(device_type)
                 
-                return jsonify({
+                return json_response({
                     'success': success,
                     'message': message,
                     'status': status
                 })
                 
             except Exception as e:
-                return jsonify({
+                return json_response({
                     'success': False,
                     'message': f'Error getting device status: {str(e)}'
                 })
-
-        @self.app.route('/<duck_type>/launch_gait_playground', methods=['POST'])
-        def launch_gait_playground(duck_type):
-            """Launch the gait playground for a specific duck type."""
-            try:
-                # Get variant from query parameters
-                variant = request.args.get('variant')
-                
-                # Get the internal name using duck_config
-                internal_name = self.get_internal_duck_type(duck_type, variant)
-                if not internal_name:
-                    return jsonify({
-                        'success': False,
-                        'message': f'Invalid duck type or variant: {duck_type}/{variant}'
-                    }), 400
-                
-                # Launch the playground
-                success, message, data = self.motion_service.gait_playground(
-                    duck_type=internal_name,
-                    variant=variant
-                )
-                
-                return jsonify({
-                    'success': success,
-                    'message': message,
-                    'data': data
-                })
-            except Exception as e:
-                logger.error(f"Error launching playground for {duck_type}: {str(e)}")
-                return jsonify({
-                    'success': False,
-                    'message': f"Error launching playground: {str(e)}"
-                }), 500 
\ No newline at end of file
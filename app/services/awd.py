@@ -7,7 +7,8 @@ from typing import Tuple, Optional, List, Dict
 from datetime import datetime
 import traceback
 from ..config import duck_config, TRAINED_MODELS_DIR
-from ..utils.command import run_command
+from ..utils.command import is_package_message, run_command
+from ..utils.files import replace_symlink
 
 class AWDService:
     _instance = None
@@ -39,9 +40,15 @@ class AWDService:
                 self.logger.warning(f"No duck configuration found for internal name {duck_type}")
                 # Continue with the original duck_type
 
+            # Check the motion file before creating the run directory
+            if motion_file:
+                motion_path = self.workspace_root / motion_file
+                if not motion_path.exists():
+                    return False, f"Motion file not found: {motion_file}", None
+            
             # Prepare output directory
             run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_dir = self.workspace_root / TRAINED_MODELS_DIR / duck_type / f"awd_{run_id}"
+            output_dir = TRAINED_MODELS_DIR / duck_type / f"awd_{run_id}"
             output_dir.mkdir(parents=True, exist_ok=True)
             
             # Build command
@@ -50,9 +57,6 @@ class AWDService:
             cmd.extend(['--num_envs', str(num_envs)])
             
             if motion_file:
-                motion_path = self.workspace_root / motion_file
-                if not motion_path.exists():
-                    return False, f"Motion file not found: {motion_file}", None
                 cmd.extend(['--motion_file', str(motion_path)])
             
             # Add output directory
@@ -91,10 +95,8 @@ class AWDService:
                 training_output['model_files'].append(str(model_file.name))
             
             # Create latest symlink
-            latest_link = self.workspace_root / TRAINED_MODELS_DIR / duck_type / 'latest_awd'
-            if latest_link.exists():
-                latest_link.unlink()
-            latest_link.symlink_to(output_dir, target_is_directory=True)
+            latest_link = TRAINED_MODELS_DIR / duck_type / 'latest_awd'
+            replace_symlink(latest_link, output_dir)
             
             return True, "AWD training completed successfully", training_output
             
@@ -212,9 +214,9 @@ class AWDService:
             if frames:
                 cmd.extend(['--frames'] + frames)
                 
-            stdout, stderr = self.run_command(cmd, str(self.submodule_dir))
+            stdout, stderr, success = run_command(cmd, str(self.submodule_dir), logger=self.logger)
             
-            if stderr and not ("Uninstalled" in stderr or "Installed" in stderr):
+            if not success or (stderr and not is_package_message(stderr)):
                 return False, "URDF viewing failed", stderr
                 
             return True, "URDF viewer launched successfully", stdout
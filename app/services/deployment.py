@@ -1,7 +1,5 @@
 import subprocess
 import os
-import paramiko
-import serial
 import logging
 from pathlib import Path
 from typing import Tuple, Optional, Dict, List
@@ -35,6 +33,9 @@ class DeploymentService:
                 self.serial_connection.close()
                 self.logger.info("Closed existing serial connection")
                 
+            # Imported here so app startup does not pay for it
+            import serial
+            
             # Open new connection
             self.serial_connection = serial.Serial(port, baudrate)
             self.logger.info(f"Successfully connected to {port}")
@@ -56,6 +57,9 @@ class DeploymentService:
                 self.ssh_connection.close()
                 self.logger.info("Closed existing SSH connection")
                 
+            # paramiko loads the whole cryptography stack; only import it when used
+            import paramiko
+            
             # Open new connection
             self.ssh_connection = paramiko.SSHClient()
             self.ssh_connection.set_missing_host_key_policy(paramiko.AutoAddPolicy())
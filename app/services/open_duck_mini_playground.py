@@ -7,10 +7,12 @@ import json
 import logging
 from typing import Tuple, Optional, List, Dict
 import tempfile
+import threading
 from datetime import datetime
 import traceback
 from ..config import duck_config, GENERATED_MOTIONS_DIR, TRAINED_MODELS_DIR
-from ..utils.command import run_command
+from ..utils.command import is_package_message, run_command
+from ..utils.files import replace_symlink, scan_by_suffix, wait_for_files
 
 # Configure logging with more detailed format
 logging.basicConfig(
@@ -33,6 +35,11 @@ class OpenDuckPlaygroundService:
             self.submodule_dir = workspace_root / 'submodules/open_duck_playground'
             self.logger = logging.getLogger(__name__)
             
+            # Guards the playground process handle across concurrent launches
+            self._playground_lock = threading.Lock()
+            self._current_playground_process = None
+            self._current_playground_model = None
+            
             # Log initialization details
             self.logger.info("Initializing OpenDuckPlaygroundService")
             self.logger.debug(f"Workspace root: {workspace_root}")
@@ -45,16 +52,13 @@ class OpenDuckPlaygroundService:
                 self.logger.error(f"Submodule directory does not exist: {self.submodule_dir}")
                 raise FileNotFoundError(f"Submodule directory not found: {self.submodule_dir}")
                 
-            # Check if submodule directory is a git repository
-            try:
-                subprocess.run(['git', 'rev-parse', '--git-dir'], 
-                             cwd=self.submodule_dir, 
-                             check=True, 
-                             capture_output=True)
+            # Check if submodule directory is a git repository. A checked out
+            # submodule has a .git file (a plain clone a .git directory), so a
+            # stat is enough; no need to spawn git
+            if (self.submodule_dir / '.git').exists():
                 self.logger.debug("Submodule directory is a valid git repository")
-            except subprocess.CalledProcessError as e:
-                self.logger.error(f"Submodule directory is not a git repository: {e}")
-                self.logger.error(f"Git error output: {e.stderr.decode()}")
+            else:
+                self.logger.error(f"Submodule directory is not a git repository: {self.submodule_dir}")
             
             # Available environments and tasks
             self.available_envs = {
@@ -98,7 +102,7 @@ class OpenDuckPlaygroundService:
             self.logger.debug(f"Base duck type: {base_duck_type}, Variant: {variant_id}")
             
             # Base directory for the duck type - using variant ID instead of internal name
-            base_dir = self.workspace_root / TRAINED_MODELS_DIR / base_duck_type / variant_id
+            base_dir = TRAINED_MODELS_DIR / base_duck_type / variant_id
             self.logger.debug(f"Searching in base directory: {base_dir}")
             
             if not base_dir.exists():
@@ -108,11 +112,11 @@ class OpenDuckPlaygroundService:
             available_models = []
             
             # First, look for any .onnx files directly in the variant directory
-            direct_onnx_files = list(base_dir.glob('*.onnx'))
+            direct_onnx_files = scan_by_suffix(base_dir, '.onnx')
             for onnx_file in direct_onnx_files:
-                self.logger.debug(f"Found standalone .onnx file: {onnx_file}")
+                self.logger.debug("Found standalone .onnx file: %s", onnx_file.path)
                 model_info = {
-                    'path': str(onnx_file.parent),
+                    'path': str(base_dir),
                     'variant': variant_id,
                     'files': [onnx_file.name],
                     'is_latest': False,
@@ -127,7 +131,7 @@ class OpenDuckPlaygroundService:
             
             for model_dir in model_dirs:
                 # Look for .onnx files in each directory
-                onnx_files = list(model_dir.glob('*.onnx'))
+                onnx_files = scan_by_suffix(model_dir, '.onnx')
                 if onnx_files:
                     self.logger.debug(f"Found {len(onnx_files)} .onnx files in {model_dir}")
                     is_latest = model_dir.name.startswith('latest_')
@@ -173,31 +177,37 @@ class OpenDuckPlaygroundService:
             self.logger.debug(f"Base duck type: {base_duck_type}, Variant: {variant_id}")
             
             # Base directory for the duck type - using variant ID instead of internal name
-            base_dir = self.workspace_root / TRAINED_MODELS_DIR / base_duck_type / variant_id
+            base_dir = TRAINED_MODELS_DIR / base_duck_type / variant_id
             self.logger.debug(f"Checking base directory: {base_dir}")
             
             if not base_dir.exists():
                 self.logger.error(f"Base directory does not exist: {base_dir}")
                 return None
             
-            # Look for latest model directory
-            latest_dirs = [d for d in base_dir.iterdir() if d.is_dir() and d.name.startswith('latest_')]
-            if not latest_dirs:
+            # Use the most recently modified latest_* directory; scandir entries
+            # keep their stat results, so each link is only stat'ed once
+            latest_dir = None
+            latest_mtime = -1
+            with os.scandir(base_dir) as entries:
+                for entry in entries:
+                    if not entry.name.startswith('latest_') or not entry.is_dir():
+                        continue
+                    mtime = entry.stat().st_mtime_ns
+                    if mtime > latest_mtime:
+                        latest_dir, latest_mtime = entry.path, mtime
+            if latest_dir is None:
                 self.logger.error(f"No latest model found for {duck_type}")
                 return None
-                
-            # Use the most recently modified latest directory
-            latest_dir = max(latest_dirs, key=lambda d: d.stat().st_mtime)
             self.logger.debug(f"Found latest model directory: {latest_dir}")
             
             # Look for .onnx file
-            onnx_files = list(latest_dir.glob('*.onnx'))
+            onnx_files = scan_by_suffix(latest_dir, '.onnx')
             if not onnx_files:
                 self.logger.error(f"No .onnx file found in {latest_dir}")
                 return None
                 
             # Use the first .onnx file found
-            model_path = str(onnx_files[0])
+            model_path = onnx_files[0].path
             self.logger.info(f"Using latest model: {model_path}")
             return model_path
             
@@ -234,8 +244,30 @@ class OpenDuckPlaygroundService:
             else:
                 self.logger.warning(f"No duck configuration found for internal name {duck_type}")
             
+            # Validate everything before creating any directories
+            env = params.get('env', 'joystick')
+            task = params.get('task', 'flat_terrain')
+            
+            self.logger.debug(f"Validating environment: {env}")
+            self.logger.debug(f"Validating task: {task}")
+            
+            if env not in self.available_envs:
+                self.logger.error(f"Invalid environment: {env}")
+                return False, f"Invalid environment: {env}. Available: {list(self.available_envs.keys())}", None
+                
+            if task not in self.available_envs[env]['tasks']:
+                self.logger.error(f"Invalid task: {task} for environment {env}")
+                return False, f"Invalid task: {task} for environment {env}. Available: {list(self.available_envs[env]['tasks'].keys())}", None
+            
+            # Check if runner.py exists
+            runner_path = self.submodule_dir / 'playground' / duck_type / 'runner.py'
+            self.logger.debug(f"Checking if runner.py exists at: {runner_path}")
+            if not runner_path.exists():
+                self.logger.error(f"runner.py not found at: {runner_path}")
+                return False, f"runner.py not found at: {runner_path}", None
+            
             # Create output directory using TRAINED_MODELS_DIR
-            output_dir = self.workspace_root / TRAINED_MODELS_DIR / duck_type
+            output_dir = TRAINED_MODELS_DIR / duck_type
             self.logger.debug(f"Creating output directory: {output_dir}")
             output_dir.mkdir(parents=True, exist_ok=True)
             self.logger.debug(f"Created output directory: {output_dir}")
@@ -263,21 +295,6 @@ class OpenDuckPlaygroundService:
                 cmd.extend(['--output_dir', str(temp_dir_path)])
                 cmd.extend(['--num_timesteps', str(params.get('num_timesteps', '150000000'))])
                 
-                # Validate and add environment and task
-                env = params.get('env', 'joystick')
-                task = params.get('task', 'flat_terrain')
-                
-                self.logger.debug(f"Validating environment: {env}")
-                self.logger.debug(f"Validating task: {task}")
-                
-                if env not in self.available_envs:
-                    self.logger.error(f"Invalid environment: {env}")
-                    return False, f"Invalid environment: {env}. Available: {list(self.available_envs.keys())}", None
-                    
-                if task not in self.available_envs[env]['tasks']:
-                    self.logger.error(f"Invalid task: {task} for environment {env}")
-                    return False, f"Invalid task: {task} for environment {env}. Available: {list(self.available_envs[env]['tasks'].keys())}", None
-                
                 cmd.extend(['--env', env])
                 cmd.extend(['--task', task])
                 
@@ -292,13 +309,6 @@ class OpenDuckPlaygroundService:
                 self.logger.debug(f"Duck type: {duck_type}")
                 self.logger.debug(f"Temp directory: {temp_dir_path}")
                 
-                # Check if runner.py exists
-                runner_path = self.submodule_dir / 'playground' / duck_type / 'runner.py'
-                self.logger.debug(f"Checking if runner.py exists at: {runner_path}")
-                if not runner_path.exists():
-                    self.logger.error(f"runner.py not found at: {runner_path}")
-                    return False, f"runner.py not found at: {runner_path}", None
-                
                 # Run training command using the utility function
                 self.logger.debug("Starting command execution...")
                 stdout, stderr, success = run_command(cmd, str(self.submodule_dir), logger=self.logger)
@@ -318,34 +328,27 @@ class OpenDuckPlaygroundService:
                 log_output = []
                 if stdout:
                     log_output.append("Command Output:")
-                    log_output.extend(stdout.split('\n'))
+                    log_output.append(stdout)
                     self.logger.debug(f"Command output: {stdout}")
                 
                 if stderr:
-                    if "Failed to uninstall package" in stderr or "Installed" in stderr:
+                    if is_package_message(stderr):
                         log_output.append("\nPackage Installation Messages:")
-                        log_output.extend(stderr.split('\n'))
+                        log_output.append(stderr)
                         self.logger.debug(f"Package messages: {stderr}")
                     else:
                         log_output.append("\nErrors:")
-                        log_output.extend(stderr.split('\n'))
+                        log_output.append(stderr)
                         self.logger.warning(f"Command errors: {stderr}")
                 
                 # Wait for model files
                 self.logger.info("Waiting for model files to be generated...")
                 max_wait = 30
-                wait_interval = 0.5
-                waited = 0
-                
-                while waited < max_wait:
-                    model_files = list(temp_dir_path.glob('*.onnx'))
-                    if model_files:
-                        self.logger.info(f"Found {len(model_files)} model files after {waited}s")
-                        self.logger.debug(f"Model files found: {[f.name for f in model_files]}")
-                        break
-                    self.logger.debug(f"No model files found yet, waiting {wait_interval}s...")
-                    time.sleep(wait_interval)
-                    waited += wait_interval
+                started = time.monotonic()
+                model_files = wait_for_files([temp_dir_path], '*.onnx', timeout=max_wait)
+                if model_files:
+                    self.logger.info(f"Found {len(model_files)} model files after {time.monotonic() - started:.1f}s")
+                    self.logger.debug(f"Model files found: {[f.name for f in model_files]}")
                 
                 if not model_files:
                     self.logger.error("No model files were generated")
@@ -356,23 +359,22 @@ class OpenDuckPlaygroundService:
                 
                 # Create run-specific output directory and copy files
                 try:
-                    self.logger.info("Copying generated files to output directory...")
+                    self.logger.info("Moving generated files to output directory...")
                     run_output_dir = output_dir / run_id
                     self.logger.debug(f"Creating run output directory: {run_output_dir}")
                     run_output_dir.mkdir(exist_ok=True)
                     
+                    # The temporary directory is deleted afterwards, so the
+                    # models are moved (a rename when on the same filesystem)
                     for file in model_files:
                         dest_file = run_output_dir / file.name
-                        self.logger.debug(f"Copying {file} to {dest_file}")
-                        shutil.copy2(file, dest_file)
+                        self.logger.debug("Moving %s to %s", file, dest_file)
+                        shutil.move(file, dest_file)
                     
                     # Update latest symlink
                     latest_link = output_dir / f'latest_{duck_type}'
                     self.logger.debug(f"Updating symlink {latest_link} -> {run_output_dir}")
-                    if latest_link.exists():
-                        self.logger.debug("Removing existing symlink")
-                        latest_link.unlink()
-                    latest_link.symlink_to(run_output_dir, target_is_directory=True)
+                    replace_symlink(latest_link, run_output_dir)
                     
                 except Exception as e:
                     self.logger.error(f"Error copying generated files: {str(e)}")
@@ -480,17 +482,17 @@ class OpenDuckPlaygroundService:
             log_output = []
             if stdout:
                 log_output.append("Command Output:")
-                log_output.extend(stdout.split('\n'))
+                log_output.append(stdout)
                 self.logger.debug(f"Command output: {stdout}")
             
             if stderr:
-                if "Failed to uninstall package" in stderr or "Installed" in stderr:
+                if is_package_message(stderr):
                     log_output.append("\nPackage Installation Messages:")
-                    log_output.extend(stderr.split('\n'))
+                    log_output.append(stderr)
                     self.logger.debug(f"Package messages: {stderr}")
                 else:
                     log_output.append("\nErrors:")
-                    log_output.extend(stderr.split('\n'))
+                    log_output.append(stderr)
                     self.logger.warning(f"Command errors: {stderr}")
             
             self.logger.info("Inference completed successfully")
@@ -539,23 +541,36 @@ class OpenDuckPlaygroundService:
             self.logger.info(f"Executing command: {' '.join(cmd)}")
             self.logger.debug(f"Working directory: {self.submodule_dir}")
             
-            # Get current environment and ensure DISPLAY is set
-            current_env = os.environ.copy()
-            if 'DISPLAY' not in current_env:
-                current_env['DISPLAY'] = ':0'  # Default to primary display
+            # Ensure DISPLAY is set; the environment is only copied when it
+            # needs changing, otherwise the child inherits it as is
+            current_env = None
+            if 'DISPLAY' not in os.environ:
+                current_env = {**os.environ, 'DISPLAY': ':0'}  # Default to primary display
             
             # Run command using Popen without capturing output
-            process = subprocess.Popen(
-                cmd,
-                cwd=str(self.submodule_dir),
-                env=current_env,
-                stdout=None,  # Don't capture stdout
-                stderr=None,  # Don't capture stderr
-                creationflags=subprocess.CREATE_NEW_CONSOLE if os.name == 'nt' else 0  # Windows-specific flag
-            )
-            
-            # Store process for later management if needed
-            self._current_playground_process = process
+            with self._playground_lock:
+                # Reuse the viewer we launched if it is still showing this model;
+                # poll() on the stored handle avoids scanning the process table
+                process = self._current_playground_process
+                if process is not None and process.poll() is None and self._current_playground_model == model_path:
+                    self.logger.info(f"Playground already running with pid {process.pid}")
+                    return True, "Playground already running", {
+                        'model_path': model_path,
+                        'process_id': process.pid
+                    }
+                
+                process = subprocess.Popen(
+                    cmd,
+                    cwd=str(self.submodule_dir),
+                    env=current_env,
+                    stdout=None,  # Don't capture stdout
+                    stderr=None,  # Don't capture stderr
+                    creationflags=subprocess.CREATE_NEW_CONSOLE if os.name == 'nt' else 0  # Windows-specific flag
+                )
+                
+                # Store process for later management if needed
+                self._current_playground_process = process
+                self._current_playground_model = model_path
             
             self.logger.info("Playground launched successfully")
             return True, "Playground launched successfully", {
@@ -3,14 +3,19 @@ import os
 from pathlib import Path
 import shutil
 import time
-import json
 import logging
+import orjson
 from typing import Tuple, Optional, List, Dict
 import tempfile
+import threading
 from datetime import datetime
 import traceback
 from ..config import duck_config, GENERATED_MOTIONS_DIR
-from ..utils.command import run_command
+from ..utils.command import is_package_message, run_command
+from ..utils.files import replace_symlink, scan_by_suffix, wait_for_files
+
+# How long to watch a freshly launched gait playground for an early failure
+_GAIT_STARTUP_WAIT = 0.5
 
 class ReferenceMotionGenerationService:
     _instance = None
@@ -25,7 +30,13 @@ class ReferenceMotionGenerationService:
         if not self._initialized:
             self.workspace_root = workspace_root
             self.submodule_dir = workspace_root / 'submodules/open_duck_reference_motion_generator'
+            self.playground_root = workspace_root / 'submodules/open_duck_playground/playground'
             self.logger = logging.getLogger(__name__)
+            
+            # The gait playground is a GUI that runs until closed; its handle
+            # is kept so repeated launches can find it still running
+            self._gait_lock = threading.Lock()
+            self._gait_process = None
             self._initialized = True
         
     def generate_motion(self, 
@@ -61,7 +72,7 @@ class ReferenceMotionGenerationService:
             self.logger.debug(f"Base duck type: {base_duck_type}, Variant: {variant_id}")
             
             # Base directory for the duck type - using variant ID instead of internal name
-            output_dir = self.workspace_root / GENERATED_MOTIONS_DIR / base_duck_type / variant_id
+            output_dir = GENERATED_MOTIONS_DIR / base_duck_type / variant_id
             self.logger.debug(f"Using output directory: {output_dir}")
             output_dir.mkdir(parents=True, exist_ok=True)
             
@@ -149,32 +160,26 @@ class ReferenceMotionGenerationService:
                 log_output = []
                 if stdout:
                     log_output.append("Command Output:")
-                    log_output.extend(stdout.split('\n'))
+                    log_output.append(stdout)
                     self.logger.debug(f"Command output: {stdout}")
                 
                 if stderr:
-                    if "Failed to uninstall package" in stderr or "Installed" in stderr:
+                    if is_package_message(stderr):
                         log_output.append("\nPackage Installation Messages:")
-                        log_output.extend(stderr.split('\n'))
+                        log_output.append(stderr)
                         self.logger.debug(f"Package messages: {stderr}")
                     else:
                         log_output.append("\nErrors:")
-                        log_output.extend(stderr.split('\n'))
+                        log_output.append(stderr)
                         self.logger.warning(f"Command errors: {stderr}")
                 
                 # Wait for motion files
                 self.logger.info("Waiting for motion files to be generated...")
                 max_wait = 30
-                wait_interval = 0.5
-                waited = 0
-                
-                while waited < max_wait:
-                    motion_files = list(temp_dir_path.glob('*.json'))
-                    if motion_files:
-                        self.logger.info(f"Found {len(motion_files)} motion files after {waited}s")
-                        break
-                    time.sleep(wait_interval)
-                    waited += wait_interval
+                started = time.monotonic()
+                motion_files = wait_for_files([temp_dir_path], '*.json', timeout=max_wait)
+                if motion_files:
+                    self.logger.info(f"Found {len(motion_files)} motion files after {time.monotonic() - started:.1f}s")
                 
                 if not motion_files:
                     self.logger.error("No motion files were generated")
@@ -212,39 +217,28 @@ class ReferenceMotionGenerationService:
                 
                 if fit_stdout:
                     log_output.append("\nPolynomial Fitting Output:")
-                    log_output.extend(fit_stdout.split('\n'))
+                    log_output.append(fit_stdout)
                     self.logger.debug(f"Fit output: {fit_stdout}")
-                if fit_stderr and not ("Uninstalled" in fit_stderr or "Installed" in fit_stderr):
+                if fit_stderr and not is_package_message(fit_stderr):
                     log_output.append("\nPolynomial Fitting Errors:")
-                    log_output.extend(fit_stderr.split('\n'))
+                    log_output.append(fit_stderr)
                     self.logger.warning(f"Fit errors: {fit_stderr}")
                 
-                # Wait for polynomial coefficients file
-                self.logger.info("Waiting for polynomial coefficients file...")
-                waited = 0
-                pkl_file = None
-                while waited < max_wait:
-                    possible_pkl_locations = [
-                        temp_dir_path / 'polynomial_coefficients.pkl',
-                        self.submodule_dir / 'polynomial_coefficients.pkl'
-                    ]
-                    
-                    for loc in possible_pkl_locations:
-                        if loc.exists():
-                            pkl_file = loc
-                            break
-                    if pkl_file:
-                        self.logger.info(f"Found polynomial coefficients file at {pkl_file} after {waited}s")
-                        break
-                    time.sleep(wait_interval)
-                    waited += wait_interval
+                # fit_poly has exited, so its output is complete: look for it
+                # once instead of waiting
+                pkl_files = wait_for_files(
+                    [temp_dir_path, self.submodule_dir], 'polynomial_coefficients.pkl', timeout=0
+                )
+                pkl_file = pkl_files[0] if pkl_files else None
+                if pkl_file:
+                    self.logger.info(f"Found polynomial coefficients file at {pkl_file}")
                 
                 if not pkl_file:
                     self.logger.error("No polynomial coefficients file was generated")
                     # Check the directory contents
                     self.logger.debug(f"Temp directory contents: {list(temp_dir_path.glob('*'))}")
                     self.logger.debug(f"Submodule directory contents: {list(self.submodule_dir.glob('*.pkl'))}")
-                    return False, "No polynomial coefficients file was generated after waiting 30s", {
+                    return False, "fit_poly did not produce a polynomial coefficients file", {
                         'output': '\n'.join(log_output)
                     }
                 
@@ -254,28 +248,43 @@ class ReferenceMotionGenerationService:
                     run_output_dir = output_dir / run_id
                     run_output_dir.mkdir(exist_ok=True)
                     
+                    # The temporary directory is removed afterwards, so its files
+                    # are moved (a rename on the same filesystem) rather than copied
+                    moved_files = []
                     for file in motion_files:
                         dest_file = run_output_dir / file.name
-                        self.logger.debug(f"Copying {file} to {dest_file}")
-                        shutil.copy2(file, dest_file)
+                        self.logger.debug("Moving %s to %s", file, dest_file)
+                        moved_files.append(Path(shutil.move(file, dest_file)))
+                    motion_files = moved_files
                     
                     dest_pkl = run_output_dir / pkl_file.name
-                    self.logger.debug(f"Copying {pkl_file} to {dest_pkl}")
-                    shutil.copy2(pkl_file, dest_pkl)
+                    if pkl_file.parent == temp_dir_path:
+                        self.logger.debug("Moving %s to %s", pkl_file, dest_pkl)
+                        pkl_file = Path(shutil.move(pkl_file, dest_pkl))
+                    else:
+                        # fit_poly rewrites this file on every run, so the run
+                        # needs its own copy; file metadata is not needed
+                        self.logger.debug("Copying %s to %s", pkl_file, dest_pkl)
+                        shutil.copyfile(pkl_file, dest_pkl)
                     
                     # Update latest symlink - using variant-specific path
                     latest_link = output_dir / f'latest_{variant_id}'
                     self.logger.debug(f"Updating symlink {latest_link} -> {run_output_dir}")
-                    if latest_link.exists():
-                        latest_link.unlink()
-                    latest_link.symlink_to(run_output_dir, target_is_directory=True)
+                    replace_symlink(latest_link, run_output_dir)
                     
                     # Copy to playground if needed
                     try:
-                        playground_pkl_path = self.workspace_root / 'submodules/open_duck_playground/playground' / base_duck_type / 'data' / pkl_file.name
+                        playground_pkl_path = self.playground_root / base_duck_type / 'data' / pkl_file.name
                         playground_pkl_path.parent.mkdir(parents=True, exist_ok=True)
-                        self.logger.debug(f"Copying {pkl_file} to playground: {playground_pkl_path}")
-                        shutil.copy2(pkl_file, playground_pkl_path)
+                        # Hard link the run's copy when both live on the same
+                        # filesystem; fall back to copying otherwise
+                        playground_pkl_path.unlink(missing_ok=True)
+                        try:
+                            os.link(dest_pkl, playground_pkl_path)
+                            self.logger.debug("Linked %s into playground: %s", dest_pkl, playground_pkl_path)
+                        except OSError:
+                            self.logger.debug("Copying %s to playground: %s", dest_pkl, playground_pkl_path)
+                            shutil.copyfile(dest_pkl, playground_pkl_path)
                     except Exception as e:
                         self.logger.warning(f"Error copying files to playground: {str(e)}")
                         log_output.append(f"\nWarning: Error copying files to playground: {str(e)}")
@@ -291,8 +300,8 @@ class ReferenceMotionGenerationService:
                 try:
                     sample_motion_file = motion_files[0]
                     self.logger.debug(f"Reading sample motion file for preview: {sample_motion_file}")
-                    with open(sample_motion_file, 'r') as f:
-                        motion_data = json.load(f)
+                    with open(sample_motion_file, 'rb') as f:
+                        motion_data = orjson.loads(f.read())
                         
                     self.logger.info("Motion generation completed successfully")
                     return True, "Motion generation completed successfully", {
@@ -363,20 +372,43 @@ class ReferenceMotionGenerationService:
             self.logger.debug(f"Command as list: {cmd}")
             self.logger.debug(f"Working directory: {self.submodule_dir}")
             
-            stdout, stderr, success = run_command(cmd, str(self.submodule_dir), logger=self.logger)
-            
-            if not success:
-                self.logger.error("Gait playground command failed")
-                return False, "Gait playground command failed", {
-                    'command': ' '.join(cmd),
-                    'stdout': stdout,
-                    'stderr': stderr
-                }
+            with self._gait_lock:
+                process = self._gait_process
+                if process is not None and process.poll() is None:
+                    self.logger.info(f"Gait playground already running with pid {process.pid}")
+                    return True, "Gait playground already running", {
+                        'process_id': process.pid
+                    }
+                
+                # Don't wait for the window to be closed; only long enough to
+                # catch a command that fails straight away. stderr goes to an
+                # unnamed file so a chatty child can never block on a full pipe.
+                with tempfile.TemporaryFile() as stderr_file:
+                    process = subprocess.Popen(
+                        cmd,
+                        cwd=str(self.submodule_dir),
+                        stdout=subprocess.DEVNULL,
+                        stderr=stderr_file
+                    )
+                    try:
+                        returncode = process.wait(timeout=_GAIT_STARTUP_WAIT)
+                    except subprocess.TimeoutExpired:
+                        returncode = None
+                    
+                    if returncode:
+                        stderr_file.seek(0)
+                        stderr = stderr_file.read().decode(errors='replace')
+                        self.logger.error("Gait playground command failed")
+                        return False, "Gait playground command failed", {
+                            'command': ' '.join(cmd),
+                            'stderr': stderr
+                        }
+                
+                self._gait_process = process
             
             self.logger.info("Gait playground launched successfully")
             return True, "Gait playground launched successfully", {
-                'stdout': stdout,
-                'stderr': stderr
+                'process_id': process.pid
             }
 
         except Exception as e:
@@ -387,10 +419,32 @@ class ReferenceMotionGenerationService:
                 'traceback': traceback.format_exc()
             }
         
+    def listing_dir(self, kind: str, duck_type: str) -> Optional[Path]:
+        """
+        Get the directory scanned when listing files of a given kind.
+        
+        Args:
+            kind: One of 'motion', 'training' or 'testing'
+            duck_type: Internal duck name (or base duck type for training/testing)
+            
+        Returns:
+            Directory path, or None if the duck type cannot be resolved
+        """
+        duck_info = duck_config.find_by_internal_name(duck_type)
+        if kind == 'motion':
+            if not duck_info:
+                return None
+            return GENERATED_MOTIONS_DIR / duck_info['duck_type'] / duck_info['variant']
+        
+        # Training and testing files are stored per base duck type
+        if duck_info:
+            duck_type = duck_info['duck_type']
+        return self.workspace_root / kind / duck_type
+        
     def list_motion_files(self, duck_type: str, variant: str = None) -> List[str]:
         """List available motion files for a specific duck type."""
         try:
-            self.logger.debug(f"Listing motion files for {duck_type} (variant: {variant})")
+            self.logger.debug("Listing motion files for %s (variant: %s)", duck_type, variant)
             
             # Get the base duck type and variant from the internal name
             duck_info = duck_config.find_by_internal_name(duck_type)
@@ -400,31 +454,32 @@ class ReferenceMotionGenerationService:
                 
             base_duck_type = duck_info['duck_type']
             variant_id = duck_info['variant']  # This will be 'v1', 'v2', etc.
-            self.logger.debug(f"Base duck type: {base_duck_type}, Variant: {variant_id}")
+            self.logger.debug("Base duck type: %s, Variant: %s", base_duck_type, variant_id)
             
             # Check motion directory using variant ID
-            motion_dir = self.workspace_root / GENERATED_MOTIONS_DIR / base_duck_type / variant_id
+            motion_dir = self.listing_dir('motion', duck_type)
             if not motion_dir.exists():
-                self.logger.debug(f"Motion directory does not exist: {motion_dir}")
+                self.logger.debug("Motion directory does not exist: %s", motion_dir)
                 return []
             
             # Get a list of available motion files
             motion_files = []
-            for run_dir in motion_dir.iterdir():
-                if not run_dir.is_dir():
-                    continue
-                    
-                self.logger.debug(f"Checking run directory: {run_dir}")
-                for file in run_dir.glob('*.json'):
-                    motion_files.append({
-                        'name': file.name,
-                        'path': str(file.relative_to(self.workspace_root)),
-                        'date': datetime.fromtimestamp(file.stat().st_mtime).isoformat()
-                    })
+            with os.scandir(motion_dir) as run_dirs:
+                for run_dir in run_dirs:
+                    if not run_dir.is_dir():
+                        continue
+                        
+                    self.logger.debug("Checking run directory: %s", run_dir.path)
+                    for file in scan_by_suffix(run_dir.path, '.json'):
+                        motion_files.append({
+                            'name': file.name,
+                            'path': os.path.relpath(file.path, self.workspace_root),
+                            'date': datetime.fromtimestamp(file.stat().st_mtime).isoformat()
+                        })
             
             # Sort by date (newest first)
             motion_files.sort(key=lambda x: x['date'], reverse=True)
-            self.logger.debug(f"Found {len(motion_files)} motion files")
+            self.logger.debug("Found %s motion files", len(motion_files))
             
             return motion_files
             
@@ -433,26 +488,69 @@ class ReferenceMotionGenerationService:
             self.logger.error(traceback.format_exc())
             return []
 
+    def get_latest_motion_file(self, duck_type: str) -> Optional[Dict]:
+        """
+        Find the most recently modified motion file for a duck type.
+        
+        Args:
+            duck_type: Internal duck name
+            
+        Returns:
+            Dict with the file name, its path relative to the workspace and its
+            absolute path, or None if no motion file exists
+        """
+        motion_dir = self.listing_dir('motion', duck_type)
+        if motion_dir is None:
+            self.logger.warning(f"No duck info found for internal name: {duck_type}")
+            return None
+        
+        latest = None
+        latest_mtime = -1
+        try:
+            with os.scandir(motion_dir) as run_dirs:
+                for run_dir in run_dirs:
+                    # The latest_* symlinks point at run directories seen anyway
+                    if not run_dir.is_dir(follow_symlinks=False):
+                        continue
+                    with os.scandir(run_dir.path) as entries:
+                        for entry in entries:
+                            if not entry.name.endswith('.json') or not entry.is_file():
+                                continue
+                            mtime = entry.stat().st_mtime_ns
+                            if mtime > latest_mtime:
+                                latest, latest_mtime = entry, mtime
+        except FileNotFoundError:
+            self.logger.debug("Motion directory does not exist: %s", motion_dir)
+            return None
+        
+        if latest is None:
+            return None
+        return {
+            'name': latest.name,
+            'path': os.path.relpath(latest.path, self.workspace_root),
+            'abs_path': latest.path
+        }
+
     def list_training_files(self, duck_type):
         """
         List all training files available for a specific duck type.
         """
-        self.logger.debug(f"Listing training files for {duck_type}")
+        self.logger.debug("Listing training files for %s", duck_type)
         
         try:
             # If we're passed an internal name, resolve it to the duck type
             duck_info = duck_config.find_by_internal_name(duck_type)
             if duck_info:
                 duck_type = duck_info['duck_type']
-                self.logger.debug(f"Resolved internal name {duck_type} to duck type {duck_info['duck_type']}")
+                self.logger.debug("Resolved internal name %s to duck type %s", duck_type, duck_info['duck_type'])
             
             # Construct path to training directory
-            training_dir = self.workspace_root / 'training' / duck_type
-            self.logger.debug(f"Looking for training files in directory: {training_dir}")
+            training_dir = self.listing_dir('training', duck_type)
+            self.logger.debug("Looking for training files in directory: %s", training_dir)
             
             # Check if directory exists
             if not training_dir.exists():
-                self.logger.debug(f"Training directory does not exist: {training_dir}")
+                self.logger.debug("Training directory does not exist: %s", training_dir)
                 return []
             
             # List all relevant training files
@@ -462,16 +560,17 @@ class ReferenceMotionGenerationService:
                     # Check for common training file extensions
                     if filename.endswith(('.pth', '.pt', '.h5', '.model', '.weights')):
                         filepath = os.path.join(root, filename)
+                        stat = os.stat(filepath)
                         file_info = {
                             'name': filename,
                             'path': filepath,
-                            'size': os.path.getsize(filepath),
-                            'created': os.path.getctime(filepath),
-                            'modified': os.path.getmtime(filepath)
+                            'size': stat.st_size,
+                            'created': stat.st_ctime,
+                            'modified': stat.st_mtime
                         }
                         training_files.append(file_info)
             
-            self.logger.debug(f"Found {len(training_files)} training files for {duck_type}")
+            self.logger.debug("Found %s training files for %s", len(training_files), duck_type)
             return training_files
             
         except Exception as e:
@@ -482,22 +581,22 @@ class ReferenceMotionGenerationService:
         """
         List all testing files available for a specific duck type.
         """
-        self.logger.debug(f"Listing testing files for {duck_type}")
+        self.logger.debug("Listing testing files for %s", duck_type)
         
         try:
             # If we're passed an internal name, resolve it to the duck type
             duck_info = duck_config.find_by_internal_name(duck_type)
             if duck_info:
                 duck_type = duck_info['duck_type']
-                self.logger.debug(f"Resolved internal name {duck_type} to duck type {duck_info['duck_type']}")
+                self.logger.debug("Resolved internal name %s to duck type %s", duck_type, duck_info['duck_type'])
             
             # Construct path to testing directory
-            testing_dir = self.workspace_root / 'testing' / duck_type
-            self.logger.debug(f"Looking for testing files in directory: {testing_dir}")
+            testing_dir = self.listing_dir('testing', duck_type)
+            self.logger.debug("Looking for testing files in directory: %s", testing_dir)
             
             # Check if directory exists
             if not testing_dir.exists():
-                self.logger.debug(f"Testing directory does not exist: {testing_dir}")
+                self.logger.debug("Testing directory does not exist: %s", testing_dir)
                 return []
             
             # List all relevant testing files
@@ -507,16 +606,17 @@ class ReferenceMotionGenerationService:
                     # Check for common testing/validation file extensions
                     if filename.endswith(('.json', '.csv', '.txt', '.log')):
                         filepath = os.path.join(root, filename)
+                        stat = os.stat(filepath)
                         file_info = {
                             'name': filename,
                             'path': filepath,
-                            'size': os.path.getsize(filepath),
-                            'created': os.path.getctime(filepath),
-                            'modified': os.path.getmtime(filepath)
+                            'size': stat.st_size,
+                            'created': stat.st_ctime,
+                            'modified': stat.st_mtime
                         }
                         testing_files.append(file_info)
             
-            self.logger.debug(f"Found {len(testing_files)} testing files for {duck_type}")
+            self.logger.debug("Found %s testing files for %s", len(testing_files), duck_type)
             return testing_files
             
         except Exception as e:
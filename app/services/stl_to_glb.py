@@ -1,8 +1,9 @@
-import trimesh
+import functools
 from pathlib import Path
 import logging
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 from ..config import duck_config, ROOT_DIR
+from ..utils.files import scan_by_suffix
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +19,8 @@ def convert_stl_to_glb(input_path: str, output_path: str) -> Tuple[bool, str]:
         Tuple of (success: bool, message: str)
     """
     try:
+        # trimesh pulls in numpy and friends; only load it when converting
+        import trimesh
         mesh = trimesh.load(input_path)
         mesh.export(output_path, file_type='glb')
         logger.info(f"Successfully converted {input_path} to {output_path}")
@@ -52,56 +55,73 @@ def convert_stl_directory(input_dir: str, output_dir: str) -> Dict[str, Tuple[bo
     
     return results
 
-def get_stl_and_glb_files(duck_type: str, variant: str = None) -> Dict[str, List[Dict]]:
+@functools.lru_cache(maxsize=64)
+def get_stl_and_glb_dirs(duck_type: str, variant: str = None) -> Optional[Tuple[Path, Path]]:
     """
-    Get lists of STL and GLB files for a specific duck type and variant.
-    Automatically converts STL to GLB if needed.
+    Get the STL source and GLB output directories for a duck type and variant.
     
     Args:
         duck_type: Type of duck (e.g., 'open_duck_mini')
         variant: Optional variant name
         
     Returns:
-        Dictionary containing lists of STL and GLB file information
+        Tuple of (stl_dir, glb_dir), or None if the duck type is unknown
     """
-    # Get duck type config
     duck_config_data = duck_config.get_duck_type(duck_type)
     if not duck_config_data:
-        logger.error(f"Invalid duck type: {duck_type}")
-        return {'stl_files': [], 'glb_files': []}
+        return None
     
     # Get STL directory from config or use default
     stl_dir = Path(duck_config_data.get('stl_directory', ROOT_DIR / 'submodules/open_duck_mini/print'))
     if not stl_dir.is_absolute():
-        stl_dir = Path(__file__).parent.parent.parent / stl_dir
+        stl_dir = ROOT_DIR / stl_dir
     
     # Construct GLB directory path
     glb_dir = ROOT_DIR / "app" / "static" / "models" / duck_type
     if variant:
         glb_dir = glb_dir / variant
     
+    return stl_dir, glb_dir
+
+duck_config.register_reload_hook(get_stl_and_glb_dirs.cache_clear)
+
+def _list_model_files(directory: Path, suffix: str) -> List[Dict]:
+    """Describe the model files with the given suffix in a directory."""
+    files = []
+    for entry in scan_by_suffix(directory, suffix):
+        stat = entry.stat()
+        files.append({
+            'name': entry.name,
+            'path': entry.path,
+            'size': stat.st_size,
+            'modified': stat.st_mtime
+        })
+    return files
+
+def get_stl_and_glb_files(duck_type: str, variant: str = None) -> Dict[str, List[Dict]]:
+    """
+    Get lists of STL and GLB files for a specific duck type and variant.
+    Automatically converts STL to GLB if needed.
+    
+    Args:
+        duck_type: Type of duck (e.g., 'open_duck_mini')
+        variant: Optional variant name
+        
+    Returns:
+        Dictionary containing lists of STL and GLB file information
+    """
+    dirs = get_stl_and_glb_dirs(duck_type, variant)
+    if dirs is None:
+        logger.error(f"Invalid duck type: {duck_type}")
+        return {'stl_files': [], 'glb_files': []}
+    stl_dir, glb_dir = dirs
+    
     # Create GLB directory if it doesn't exist
     glb_dir.mkdir(parents=True, exist_ok=True)
     
-    # Get STL files
-    stl_files = []
-    for stl_file in stl_dir.glob("*.stl"):
-        stl_files.append({
-            'name': stl_file.name,
-            'path': str(stl_file),
-            'size': stl_file.stat().st_size,
-            'modified': stl_file.stat().st_mtime
-        })
-    
-    # Get GLB files
-    glb_files = []
-    for glb_file in glb_dir.glob("*.glb"):
-        glb_files.append({
-            'name': glb_file.name,
-            'path': str(glb_file),
-            'size': glb_file.stat().st_size,
-            'modified': glb_file.stat().st_mtime
-        })
+    # Get STL and GLB files
+    stl_files = _list_model_files(stl_dir, '.stl')
+    glb_files = _list_model_files(glb_dir, '.glb')
     
     # If we have STL files but no GLB files, convert them
     if stl_files and not glb_files:
@@ -114,14 +134,7 @@ def get_stl_and_glb_files(duck_type: str, variant: str = None) -> Dict[str, List
             logger.error(f"Failed to convert some files: {failed_files}")
         else:
             # Reload GLB files after conversion
-            glb_files = []
-            for glb_file in glb_dir.glob("*.glb"):
-                glb_files.append({
-                    'name': glb_file.name,
-                    'path': str(glb_file),
-                    'size': glb_file.stat().st_size,
-                    'modified': glb_file.stat().st_mtime
-                })
+            glb_files = _list_model_files(glb_dir, '.glb')
     
     return {
         'stl_files': sorted(stl_files, key=lambda x: x['name']),
@@ -79,7 +79,24 @@ function submitForm(form, url, options = {}) {
     });
 }
 
+// Poll a background job at its status URL until it finishes and return its
+// result. Polls start fast and back off, so short jobs return quickly
+// without hammering the server during long ones.
+async function waitForJob(statusUrl) {
+    let delay = 100;
+    while (true) {
+        await new Promise(resolve => setTimeout(resolve, delay));
+        delay = Math.min(delay * 2, 2000);
+        const response = await fetch(statusUrl);
+        const data = await response.json();
+        if (!response.ok || data.done) {
+            return data;
+        }
+    }
+}
+
 // Export common functions
 window.showNotification = showNotification;
 window.validateForm = validateForm;
-window.submitForm = submitForm; 
+window.submitForm = submitForm;
+window.waitForJob = waitForJob; 
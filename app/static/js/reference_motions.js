@@ -135,10 +135,18 @@ document.addEventListener('DOMContentLoaded', function() {
             
             // Log response status
             console.log("DEBUG: Server response status:", response.status);
+            let data = await response.json();
+            
+            // Generation runs in the background; wait for the job to finish
+            if (response.status === 202 && data.job_id) {
+                progressBar.style.width = '50%';
+                addLogEntry('Generating motion...');
+                const statusUrl = response.headers.get('Location') || `/${urlPath}/motion_jobs/${data.job_id}`;
+                data = await waitForJob(statusUrl);
+            }
+            
             progressBar.style.width = '60%';
             addLogEntry('Processing server response...');
-            
-            const data = await response.json();
             console.log("DEBUG: Server response data:", data);
             
             // Check for error
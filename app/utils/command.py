@@ -1,60 +1,127 @@
 import subprocess
 import os
 import logging
+import re
+import shlex
+import threading
 import traceback
+from collections import deque
 from typing import List, Tuple, Optional, Union
 
+# uv reports package (un)installs on stderr; these lines are not errors
+_PACKAGE_MESSAGE = re.compile(r'Failed to uninstall package|Uninstalled|Installed')
+
+def is_package_message(output: str) -> bool:
+    """Check whether command stderr contains uv package installation messages."""
+    return _PACKAGE_MESSAGE.search(output) is not None
+
+# Commands such as training can log for hours; only the end of each stream is
+# kept, which is where errors and summaries are
+OUTPUT_TAIL_BYTES = 1024 * 1024
+
+def _read_tail(stream, limit: int, result: list) -> None:
+    """Read a byte stream to EOF, keeping its last limit bytes as decoded text in result."""
+    chunks = deque()
+    size = 0
+    truncated = False
+    while True:
+        chunk = stream.read1(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size += len(chunk)
+        # Drop whole chunks that fall entirely before the tail
+        while size - len(chunks[0]) >= limit:
+            size -= len(chunks.popleft())
+            truncated = True
+    stream.close()
+    
+    data = b''.join(chunks)
+    if len(data) > limit:
+        data = data[-limit:]
+        truncated = True
+    text = data.decode(errors='replace')
+    result.append(f"[... earlier output truncated ...]\n{text}" if truncated else text)
+
 def run_command(
     command: Union[List[str], str], 
     cwd: str, 
     logger: Optional[logging.Logger] = None,
     env: Optional[dict] = None,
-    timeout: Optional[int] = None
+    timeout: Optional[int] = None,
+    tail_bytes: int = OUTPUT_TAIL_BYTES
 ) -> Tuple[str, str, bool]:
     """
-    Helper function to run a shell command in the given directory.
+    Helper function to run a command in the given directory.
+    
+    Output is read while the command runs and only the last tail_bytes of each
+    stream are kept, so verbose commands don't hold their whole log in memory.
     
     Args:
-        command: The command to run, either as a list of strings or a string
+        command: The command to run, either as an argument list (executed
+            directly) or a string, which is split shell-style; no shell is
+            ever spawned
         cwd: Working directory to run the command in
         logger: Optional logger to log debug and error information
         env: Optional environment variables to set
         timeout: Optional timeout in seconds
+        tail_bytes: Maximum amount of stdout and of stderr to return
         
     Returns:
         Tuple of (stdout, stderr, success)
     """
     try:
-        if isinstance(command, list):
-            command_str = ' '.join(command)
-        else:
-            command_str = command
+        # Commands are executed directly, without spawning a shell
+        if not isinstance(command, list):
+            command = shlex.split(command)
             
         if logger:
-            logger.debug(f"Running command: {command_str}")
-            logger.debug(f"Working directory: {cwd}")
+            logger.debug("Running command: %s", shlex.join(command))
+            logger.debug("Working directory: %s", cwd)
             
-        result = subprocess.run(
-            command_str,
-            shell=True,
+        process = subprocess.Popen(
+            command,
             cwd=cwd,
-            capture_output=True,
-            text=True,
-            check=True,
-            env=env,
-            timeout=timeout
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env
         )
-        return result.stdout, result.stderr, True
-    except subprocess.CalledProcessError as e:
-        if logger:
-            logger.error(f"Command failed with exit code {e.returncode}")
-            logger.error(f"Command output: {e.stdout}")
-            logger.error(f"Command error: {e.stderr}")
-        return e.stdout, e.stderr, False
-    except subprocess.TimeoutExpired as e:
-        if logger:
-            logger.error(f"Command timed out after {timeout} seconds")
-        return "", f"Command timed out after {timeout} seconds", False
+        
+        # Drain stderr on a helper thread so neither pipe can fill up and block the command
+        stdout_result, stderr_result = [], []
+        stderr_reader = threading.Thread(
+            target=_read_tail, args=(process.stderr, tail_bytes, stderr_result), daemon=True
+        )
+        stderr_reader.start()
+        
+        timed_out = threading.Event()
+        if timeout is not None:
+            def kill():
+                timed_out.set()
+                process.kill()
+            timer = threading.Timer(timeout, kill)
+            timer.start()
+        try:
+            _read_tail(process.stdout, tail_bytes, stdout_result)
+            stderr_reader.join()
+            returncode = process.wait()
+        finally:
+            if timeout is not None:
+                timer.cancel()
+        
+        stdout, stderr = stdout_result[0], stderr_result[0]
+        if timed_out.is_set():
+            if logger:
+                logger.error(f"Command timed out after {timeout} seconds")
+            return stdout, f"Command timed out after {timeout} seconds", False
+        
+        if returncode != 0:
+            if logger:
+                logger.error(f"Command failed with exit code {returncode}")
+                logger.error(f"Command output: {stdout}")
+                logger.error(f"Command error: {stderr}")
+            return stdout, stderr, False
+        return stdout, stderr, True
     except Exception as e:
         if logger:
             logger.error(f"Exception running command: {str(e)}")
@@ -62,10 +129,11 @@ def run_command(
         return "", str(e), False
 
 def run_background_process(command, cwd=None):
-    """Run a command in the background and return the process object."""
+    """Run a command (argument list or string, split shell-style) in the background and return the process object."""
+    if not isinstance(command, list):
+        command = shlex.split(command)
     process = subprocess.Popen(
         command,
-        shell=True,
         cwd=cwd,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE
@@ -0,0 +1,129 @@
+import os
+import time
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Iterable, List, Union
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:  # Not on Linux, or inotify_simple is not installed
+    INotify = None
+
+PathLike = Union[str, Path]
+
+
+def scan_by_suffix(directory: PathLike, suffix: str) -> List[os.DirEntry]:
+    """
+    List the files in a directory whose names end with a suffix.
+
+    Cheaper than Path.glob for simple extension matches: no pattern matching,
+    and the returned entries cache their stat results.
+
+    Args:
+        directory: Directory to scan
+        suffix: Required end of the file name, e.g. '.json'
+
+    Returns:
+        Matching directory entries, empty if the directory does not exist
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return [entry for entry in entries if entry.name.endswith(suffix) and entry.is_file()]
+    except FileNotFoundError:
+        return []
+
+
+def replace_symlink(link: Path, target: PathLike) -> None:
+    """
+    Point a directory symlink at a new target in one atomic step.
+    
+    The new link is created under a temporary name and renamed over the old
+    one, so readers never find the link missing, and a dangling link is
+    replaced as well.
+    
+    Args:
+        link: Path of the symlink to create or update
+        target: Directory the link should point to
+    """
+    tmp_link = link.with_name(link.name + '.tmp')
+    tmp_link.unlink(missing_ok=True)
+    tmp_link.symlink_to(target, target_is_directory=True)
+    os.replace(tmp_link, link)
+
+
+def _find_files(directories: List[Path], pattern: str) -> List[Path]:
+    """Return the files matching pattern in the first directory that has any."""
+    # A plain file name needs one stat per directory rather than a glob
+    if not any(char in pattern for char in '*?['):
+        for directory in directories:
+            candidate = directory / pattern
+            try:
+                os.stat(candidate)
+            except FileNotFoundError:
+                continue
+            return [candidate]
+        return []
+
+    for directory in directories:
+        matches = sorted(directory.glob(pattern))
+        if matches:
+            return matches
+    return []
+
+
+def wait_for_files(
+    directories: Iterable[PathLike],
+    pattern: str,
+    timeout: float = 30.0,
+    poll_interval: float = 0.5
+) -> List[Path]:
+    """
+    Wait until files matching a glob pattern show up in one of the directories.
+
+    On Linux with inotify_simple installed the directories are watched, so the
+    wait ends as soon as a matching file is written; otherwise they are polled.
+
+    Args:
+        directories: Directories to look in, in order of preference
+        pattern: Glob pattern the file names must match
+        timeout: Maximum time to wait in seconds
+        poll_interval: Time between checks when polling
+
+    Returns:
+        The matching files from the first directory that has any, or an empty
+        list if none appeared before the timeout
+    """
+    directories = [Path(directory) for directory in directories]
+    deadline = time.monotonic() + timeout
+
+    # Usually the files are already there
+    matches = _find_files(directories, pattern)
+    if matches or timeout <= 0:
+        return matches
+
+    if INotify is None:
+        while not matches:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(poll_interval, remaining))
+            matches = _find_files(directories, pattern)
+        return matches
+
+    with INotify() as inotify:
+        for directory in directories:
+            try:
+                inotify.add_watch(str(directory), inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO)
+            except OSError:
+                continue
+
+        # Files may have appeared before the watches were added
+        matches = _find_files(directories, pattern)
+        while not matches:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            events = inotify.read(timeout=int(remaining * 1000))
+            if any(fnmatch(event.name, pattern) for event in events):
+                matches = _find_files(directories, pattern)
+        return matches
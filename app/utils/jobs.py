@@ -0,0 +1,111 @@
+import functools
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+# Training takes minutes to hours and uses the whole GPU, so runs started from
+# any endpoint share one queue and never tie up a request thread
+TRAIN_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix='duck-train')
+
+# Device I/O runs off the request thread. DeploymentService holds a single
+# serial/SSH connection, so jobs from every endpoint are run one at a time.
+DEVICE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix='duck-device')
+
+
+class JobRegistry:
+    """
+    Background jobs keyed by job id, kept until their result is fetched.
+
+    A finished job is reported once and then forgotten. Results nobody fetches
+    (the client went away) are dropped after ``ttl`` seconds, and at most
+    ``max_finished`` of them are kept, oldest dropped first.
+    """
+
+    def __init__(self, ttl: float = 3600.0, max_finished: int = 100):
+        self.ttl = ttl
+        self.max_finished = max_finished
+        # Job id -> (kind, future, detail)
+        self._jobs = {}
+        # Finished, unfetched job ids -> finish time, oldest first
+        self._finished = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, executor: Executor, task: Callable[[], Any], detail: Any = None) -> str:
+        """
+        Run a task on an executor and return the id its result is fetched with.
+
+        Args:
+            kind: Kind of job, so each status endpoint only reports its own jobs
+            executor: Executor to run the task on
+            task: Callable taking no arguments
+            detail: Extra value returned with the job, e.g. an error message prefix
+
+        Returns:
+            The new job id
+        """
+        job_id = uuid.uuid4().hex
+        future = executor.submit(task)
+        with self._lock:
+            self._jobs[job_id] = (kind, future, detail)
+        future.add_done_callback(lambda _: self._job_done(job_id))
+        return job_id
+
+    def get(self, kind: str, job_id: str) -> Optional[Tuple[Future, Any]]:
+        """
+        Look up a job; a finished job is removed, so its result is reported once.
+
+        Returns:
+            Tuple of (future, detail), or None if the job is unknown, of another
+            kind, already reported or expired
+        """
+        with self._lock:
+            self._expire()
+            job = self._jobs.get(job_id)
+            if job is None or job[0] != kind:
+                return None
+
+            _, future, detail = job
+            if future.done():
+                del self._jobs[job_id]
+                self._finished.pop(job_id, None)
+        return future, detail
+
+    def _job_done(self, job_id: str) -> None:
+        """Start the expiry clock of a finished job; runs when its future completes."""
+        with self._lock:
+            # The job may already have been reported
+            if job_id in self._jobs:
+                self._finished[job_id] = time.monotonic()
+            self._expire()
+
+    def _expire(self) -> None:
+        """Drop finished jobs that were not fetched in time, or over the cap; lock held."""
+        deadline = time.monotonic() - self.ttl
+        while self._finished:
+            job_id, finished_at = next(iter(self._finished.items()))
+            if finished_at > deadline and len(self._finished) <= self.max_finished:
+                break
+            del self._finished[job_id]
+            del self._jobs[job_id]
+
+
+# Background jobs started from any endpoint, fetched from their job endpoints
+JOBS = JobRegistry()
+
+
+def submit_device_job(error_prefix: str, fn: Callable[..., Any], **kwargs: Any) -> str:
+    """
+    Run a deploy or connect operation on the device queue and return its job id.
+
+    Args:
+        error_prefix: Prefix of the message reported if the operation raises
+        fn: DeploymentService method to call
+        **kwargs: Arguments passed to fn
+
+    Returns:
+        The new job id
+    """
+    return JOBS.submit('device', DEVICE_EXECUTOR, functools.partial(fn, **kwargs), detail=error_prefix)
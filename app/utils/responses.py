@@ -0,0 +1,146 @@
+import hashlib
+import logging
+import traceback
+import uuid
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Optional
+
+import orjson
+from flask import Response, current_app, make_response, request, session
+from flask.json.provider import DefaultJSONProvider
+
+# Changes on every restart, so pages rendered by an older process (possibly
+# with different templates) are never treated as fresh
+_PROCESS_TAG = uuid.uuid4().hex
+
+# Dates and dataclasses go through _default so they are encoded the way
+# Flask's stdlib provider does it, whichever helper serializes them
+_ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+def _default(obj: Any) -> Any:
+    """Serialize the few non-native types that show up in API payloads."""
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    if isinstance(obj, Path):
+        return str(obj)
+    # Dates, dataclasses, decimals etc. are encoded the way Flask does it
+    return DefaultJSONProvider.default(obj)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes with orjson, used by jsonify and app.json."""
+    
+    def _options(self) -> int:
+        options = _ORJSON_OPTIONS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return options
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=_default, option=self._options()).decode()
+    
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=self._options()),
+            mimetype=self.mimetype
+        )
+
+
+def debug_traceback(logger: logging.Logger) -> Optional[str]:
+    """
+    Format the exception being handled, but only when debugging.
+    
+    Tracebacks are only worth building (and exposing to clients) when the app
+    runs in debug mode or debug logging is enabled.
+    
+    Args:
+        logger: Logger whose level decides whether debug output is wanted
+        
+    Returns:
+        The formatted traceback, or None outside of debugging
+    """
+    if current_app.debug or logger.isEnabledFor(logging.DEBUG):
+        return traceback.format_exc()
+    return None
+
+
+def json_response(payload: Any, status: int = 200, headers: Optional[dict] = None) -> Response:
+    """
+    Build a JSON response using orjson.
+
+    Args:
+        payload: JSON-serializable data to send
+        status: HTTP status code
+        headers: Optional extra response headers
+
+    Returns:
+        Flask response with an application/json body
+    """
+    return Response(
+        orjson.dumps(payload, default=_default, option=_ORJSON_OPTIONS),
+        status=status,
+        headers=headers,
+        mimetype='application/json'
+    )
+
+
+def _etag(etag_parts: tuple) -> str:
+    """Derive an ETag from the values identifying a response's content."""
+    key = ':'.join(str(part) for part in (_PROCESS_TAG,) + tuple(etag_parts))
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+def conditional_json(etag_parts: tuple, build: Callable[[], Any]) -> Response:
+    """
+    Serve a JSON payload that only changes when its inputs change, honoring If-None-Match.
+    
+    Args:
+        etag_parts: Values that together identify the payload
+        build: Callable producing the payload when the client copy is stale
+        
+    Returns:
+        A 304 response if the client already has this version, otherwise the
+        JSON response with its ETag set
+    """
+    etag = _etag(etag_parts)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = json_response(build())
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response
+
+
+def conditional_page(etag_parts: tuple, render: Callable[[], Any]) -> Response:
+    """
+    Serve a page that only changes when its inputs change, honoring If-None-Match.
+    
+    Args:
+        etag_parts: Values that together identify the page content
+        render: Callable producing the page when the client copy is stale
+        
+    Returns:
+        A 304 response if the client already has this version, otherwise the
+        rendered page with its ETag set
+    """
+    # Templates may change between requests when auto-reload is on, and
+    # pending flash messages are only shown by a fresh render
+    if current_app.jinja_env.auto_reload or '_flashes' in session:
+        return make_response(render())
+    
+    etag = _etag(etag_parts)
+    
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = make_response(render())
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response
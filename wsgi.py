@@ -0,0 +1,9 @@
+"""WSGI entry point for production servers such as gunicorn."""
+from dotenv import load_dotenv
+
+# Load environment variables before the config module reads them
+load_dotenv()
+
+from app import create_app
+
+app = create_app()